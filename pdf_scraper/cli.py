@@ -1,8 +1,13 @@
 import typer
+from functools import partial
 from pathlib import Path
 from typing import Optional
 from core.processors.processor import PDFProcessor
+from core.parsers import PARSER_ENGINES, parse_page_range
+from core.parsers.ocr import OCRConfig
+from core.parsers.budget import TimeBudget
 from core.extractors.medical_report import MedicalReportExtractor
+from core.extractors.template import ExtractionTemplate, TemplateExtractor
 
 app = typer.Typer()
 
@@ -10,9 +15,34 @@ app = typer.Typer()
 def process(
     input_path: str = typer.Argument(..., help="Path to PDF file or directory"),
     output_path: str = typer.Argument(..., help="Path to save output file"),
-    output_format: str = typer.Option("json", help="Output format (json, csv, excel, text)"),
+    output_format: Optional[str] = typer.Option(None, help="Output format (json, ndjson, parquet, csv, excel, text); "
+                                                           "default ndjson for directories, json for files"),
     recursive: bool = typer.Option(False, help="Process subdirectories recursively"),
-    template: str = typer.Option("medical", help="Extraction template to use")
+    template: str = typer.Option("medical", help="Extraction template to use, or a .yaml/.json template file"),
+    engine: str = typer.Option("pdfplumber", help="Parser engine (pdfplumber, pymupdf)"),
+    stream: bool = typer.Option(False, help="Extract page by page with bounded memory for very large PDFs"),
+    ocr: bool = typer.Option(False, help="OCR pages that have no text layer"),
+    ocr_dpi: int = typer.Option(300, help="Resolution pages are rendered at for OCR"),
+    ocr_workers: Optional[int] = typer.Option(None, help="OCR worker processes (default: one per CPU, "
+                                                                 "or one per directory worker with --workers)"),
+    ocr_lang: str = typer.Option("eng", help="Tesseract language code(s)"),
+    ocr_cache_dir: Optional[str] = typer.Option(None, help="Directory caching OCR results of previously seen pages"),
+    pages: Optional[str] = typer.Option(None, help="Pages to read, e.g. 1-3,7 (default: all)"),
+    early_stop: bool = typer.Option(False, help="Stop reading pages once the template's header fields are found"),
+    plan_tables: bool = typer.Option(True, help="Pre-screen pages and skip or cheapen table detection where possible"),
+    cache: bool = typer.Option(True, help="Reuse parse results of files parsed before with the same settings"),
+    cache_dir: str = typer.Option(str(Path.home() / ".cache" / "pdf_scraper"), help="Directory of the parse cache"),
+    cache_max_mb: int = typer.Option(1024, help="Size of the parse cache before old entries are evicted"),
+    image_dir: Optional[str] = typer.Option(None, help="Write each distinct embedded image, undecoded, to this directory"),
+    page_timeout: Optional[float] = typer.Option(None, help="Seconds allowed per page before it is skipped"),
+    doc_timeout: Optional[float] = typer.Option(None, help="Seconds allowed per document before remaining pages are skipped"),
+    fields: Optional[str] = typer.Option(None, help="Comma-separated output fields to extract, e.g. patient_info,vital_signs (default: all)"),
+    profile: bool = typer.Option(False, help="Time each parsing and extraction stage; adds _timings to results and prints a report"),
+    workers: int = typer.Option(1, help="Worker processes for directories (0: one per CPU)"),
+    chunksize: int = typer.Option(1, help="Files handed to a worker process at a time"),
+    ordered: bool = typer.Option(True, help="Keep directory results in listing order rather than completion order"),
+    resume: bool = typer.Option(True, help="For ndjson directory output, skip files already in the output and unchanged "
+                                           "(tracked in <output>.manifest.jsonl); --no-resume starts over")
 ):
     """Process PDF files and extract information."""
     # Validate input path
@@ -22,51 +52,114 @@ def process(
         raise typer.Exit(1)
     
     # Validate output format
-    valid_formats = ["json", "csv", "excel", "text"]
+    valid_formats = ["json", "ndjson", "parquet", "csv", "excel", "text"]
+    if output_format is None:
+        # Directories stream one result per line, written as each file finishes
+        output_format = "ndjson" if input_path.is_dir() else "json"
     if output_format not in valid_formats:
         typer.echo(f"Error: Invalid output format. Must be one of: {', '.join(valid_formats)}")
         raise typer.Exit(1)
     
+    # Validate parser engine
+    if engine not in PARSER_ENGINES:
+        typer.echo(f"Error: Invalid engine. Must be one of: {', '.join(PARSER_ENGINES.keys())}")
+        raise typer.Exit(1)
+    
     # Select extractor based on template
     extractor_map = {
         "medical": MedicalReportExtractor,
         # Add more templates here
     }
     
-    if template not in extractor_map:
-        typer.echo(f"Error: Invalid template. Must be one of: {', '.join(extractor_map.keys())}")
+    if Path(template).suffix.lower() in ('.yaml', '.yml', '.json'):
+        try:
+            extractor_template = ExtractionTemplate.load(template)
+            extractor_class = partial(TemplateExtractor, template=extractor_template)
+            field_names = list(extractor_template.fields)
+        except (OSError, ValueError) as e:
+            typer.echo(f"Error: Invalid template file {template}: {str(e)}")
+            raise typer.Exit(1)
+    elif template in extractor_map:
+        extractor_class = extractor_map[template]
+        field_names = list(extractor_class.FIELDS)
+    else:
+        typer.echo(f"Error: Invalid template. Must be one of: {', '.join(extractor_map.keys())}, or a .yaml/.json template file")
         raise typer.Exit(1)
     
+    # Validate output fields
+    selected_fields = None
+    if fields:
+        selected_fields = [name.strip() for name in fields.split(',') if name.strip()]
+        unknown = [name for name in selected_fields if name not in field_names]
+        if unknown:
+            typer.echo(f"Error: Invalid fields: {', '.join(unknown)}. Must be among: {', '.join(field_names)}")
+            raise typer.Exit(1)
+    
+    # Configure parsers
+    parser_options = {}
+    if pages:
+        try:
+            parser_options['pages'] = parse_page_range(pages)
+        except ValueError as e:
+            typer.echo(f"Error: {str(e)}")
+            raise typer.Exit(1)
+    if not plan_tables:
+        parser_options['table_planner'] = None
+    if page_timeout or doc_timeout:
+        parser_options['budget'] = TimeBudget(page_seconds=page_timeout, document_seconds=doc_timeout)
+    if ocr:
+        parser_options['ocr'] = OCRConfig(dpi=ocr_dpi, workers=ocr_workers, lang=ocr_lang, cache_dir=ocr_cache_dir)
+    
     # Initialize processor
-    processor = PDFProcessor(extractor_map[template])
+    processor = PDFProcessor(extractor_class, engine=engine, streaming=stream,
+                             parser_options=parser_options, early_stop=early_stop,
+                             cache_dir=cache_dir if cache else None, cache_max_bytes=cache_max_mb << 20,
+                             image_dir=image_dir, fields=selected_fields, profile=profile)
     
     try:
+        output_path = Path(output_path)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        
         # Process files
+        export_options = {}
         if input_path.is_file():
             if input_path.suffix.lower() != '.pdf':
                 typer.echo("Error: Input file must be a PDF")
                 raise typer.Exit(1)
             results = processor.process_file(str(input_path))
         else:
-            results = processor.process_directory(str(input_path), recursive)
+            manifest = None
+            if output_format == "ndjson":
+                # Appended to, after dropping the lines of files to be reprocessed
+                manifest = processor.open_manifest(str(output_path), resume=resume)
+            results = processor.iter_directory(str(input_path), recursive, workers=workers or None,
+                                               chunksize=chunksize, ordered=ordered, manifest=manifest)
+            if manifest is not None:
+                export_options['append'] = resume
+            elif output_format != "parquet":
+                # Parquet is written a row group at a time; other formats in one go from the full list
+                results = list(results)
         
         # Export results
-        output_path = Path(output_path)
-        output_path.parent.mkdir(parents=True, exist_ok=True)
-        
         export_methods = {
             "json": processor.export_json,
+            "ndjson": processor.export_ndjson,
+            "parquet": processor.export_parquet,
             "csv": processor.export_csv,
             "excel": processor.export_excel,
             "text": processor.export_text
         }
         
-        export_methods[output_format](results, str(output_path))
+        export_methods[output_format](results, str(output_path), **export_options)
         typer.echo(f"Successfully processed and exported results to {output_path}")
+        if profile:
+            typer.echo(processor.timings.format_report())
         
     except Exception as e:
         typer.echo(f"Error: {str(e)}")
         raise typer.Exit(1)
+    finally:
+        processor.close()
 
 @app.command()
 def list_templates():
@@ -79,6 +172,7 @@ def list_templates():
     typer.echo("Available templates:")
     for name, description in templates.items():
         typer.echo(f"  {name}: {description}")
+    typer.echo("Or pass a .yaml/.json template file defining pattern, section, table and metadata fields.")
 
 if __name__ == "__main__":
     app() 
\ No newline at end of file
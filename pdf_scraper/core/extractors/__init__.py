@@ -5,5 +5,6 @@ Data extraction implementations.
 from .base import BaseExtractor
 from .medical_report import MedicalReportExtractor
 from .general import GeneralExtractor
+from .template import ExtractionTemplate, TemplateExtractor
 
-__all__ = ['BaseExtractor', 'MedicalReportExtractor', 'GeneralExtractor'] 
\ No newline at end of file
+__all__ = ['BaseExtractor', 'MedicalReportExtractor', 'GeneralExtractor', 'ExtractionTemplate', 'TemplateExtractor'] 
\ No newline at end of file
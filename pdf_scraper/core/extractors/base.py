@@ -1,11 +1,47 @@
 from abc import ABC, abstractmethod
-from typing import Dict, List, Any, Optional
+from contextlib import contextmanager
+from typing import Dict, List, Any, Callable, Optional, Iterable, Iterator, Set, Tuple, Union
 import re
 from ..parsers.base import BaseParser
+from ..parsers.timing import StageTimer, timed
+from .scanner import PatternScanner
+from .index import SectionIndex, TableIndex
 
 class BaseExtractor(ABC):
     """Base class for data extractors."""
     
+    # Fields an early-stop extraction needs before it stops reading pages
+    EARLY_STOP_FIELDS: Tuple[str, ...] = ()
+    
+    # Regex patterns used by the extractor, keyed by name
+    PATTERNS: Dict[str, str] = {}
+    
+    # Names of PATTERNS searched for all matches, together, by scan_patterns
+    SCAN_PATTERNS: Tuple[str, ...] = ()
+    
+    # Run document-wide pattern scans with the linear-time regex engine, if
+    # installed (see scanner.compile_pattern)
+    LINEAR_REGEX: bool = False
+    
+    # Output fields of extract(), in output order, and the page artifacts
+    # (see BaseParser.PAGE_ARTIFACTS) each one needs
+    FIELDS: Dict[str, Tuple[str, ...]] = {}
+    
+    # Type of each output field, for columnar export (see processors.parquet):
+    # 'str', 'int', 'float', or 'json' for any value stored as JSON text; a
+    # dict of types for a record with those keys; a one-element list for a
+    # list of that type. Keys missing from a result are null
+    SCHEMA: Dict[str, Any] = {}
+    
+    # Type of the 'metadata' field (see BaseParser.extract_metadata)
+    METADATA_SCHEMA: Dict[str, Any] = dict.fromkeys(
+        ('title', 'author', 'subject', 'keywords', 'creator', 'producer', 'creation_date', 'modification_date'),
+        'str'
+    )
+    
+    # Type of a table as returned by extract_tables_by_keyword
+    TABLE_SCHEMA: Dict[str, Any] = {'page': 'int', 'table': [['str']], 'bbox': ['float']}
+    
     def __init__(self, parser: BaseParser):
         """Initialize extractor with a PDF parser.
         
@@ -13,12 +49,47 @@ class BaseExtractor(ABC):
             parser: Instance of a PDF parser
         """
         self.parser = parser
+        self._last_scan: Optional[Tuple[str, Dict[str, List[Any]]]] = None
+    
+    @property
+    def timer(self) -> Optional[StageTimer]:
+        """The parser's stage timer; extraction steps are timed with it when set."""
+        return self.parser.timer
+    
+    @classmethod
+    def pattern_scanner(cls) -> PatternScanner:
+        """Scanner for the class's SCAN_PATTERNS, compiled once per class."""
+        scanner = cls.__dict__.get('_pattern_scanner')
+        if scanner is None or scanner.linear != cls.LINEAR_REGEX:
+            scanner = PatternScanner({name: cls.PATTERNS[name] for name in cls.SCAN_PATTERNS},
+                                     linear=cls.LINEAR_REGEX)
+            cls._pattern_scanner = scanner
+        return scanner
+    
+    def scan_patterns(self, text: str) -> Dict[str, List[Any]]:
+        """Find all matches of every SCAN_PATTERNS entry in text, running each pattern once.
+        
+        The result for the most recent text is kept, so the _extract_* methods
+        fed the same text share one scan.
+        
+        Args:
+            text: Text to search in
+            
+        Returns:
+            Dict[str, List[Any]]: re.findall results keyed by pattern name
+        """
+        if self._last_scan is not None and self._last_scan[0] is text:
+            return self._last_scan[1]
+        matches = self.pattern_scanner().scan(text, self.timer)
+        self._last_scan = (text, matches)
+        return matches
     
     @abstractmethod
-    def extract(self, **kwargs) -> Dict[str, Any]:
+    def extract(self, fields: Optional[Iterable[str]] = None, **kwargs) -> Dict[str, Any]:
         """Extract data from the PDF according to specific rules.
         
         Args:
+            fields: Output fields to compute (see FIELDS); all if None
             **kwargs: Additional parameters for extraction
             
         Returns:
@@ -26,6 +97,118 @@ class BaseExtractor(ABC):
         """
         pass
     
+    def select_fields(self, fields: Optional[Iterable[str]] = None) -> List[str]:
+        """Validate a field projection and narrow the parser to the artifacts it needs.
+        
+        The parser keeps the narrowed artifacts; see projection for a scoped
+        selection.
+        
+        Args:
+            fields: Output fields to compute; all FIELDS if None, making sure
+                the parser collects every artifact they need
+            
+        Returns:
+            List[str]: Selected field names in output order
+        """
+        if fields is None:
+            # Undo any narrowing left by an earlier projection on this parser
+            self.parser.artifacts |= {artifact for needed in self.FIELDS.values() for artifact in needed}
+            return list(self.FIELDS)
+        
+        requested = set(fields)
+        unknown = requested - set(self.FIELDS)
+        if unknown:
+            raise ValueError(f"Unknown fields for {type(self).__name__}: {', '.join(sorted(unknown))}. "
+                             f"Must be among: {', '.join(self.FIELDS)}")
+        selected = [name for name in self.FIELDS if name in requested]
+        # Pages are then scanned only for what the selected fields read
+        self.parser.artifacts = {artifact for name in selected for artifact in self.FIELDS[name]}
+        return selected
+    
+    @contextmanager
+    def projection(self, fields: Optional[Iterable[str]] = None) -> Iterator[List[str]]:
+        """Select fields (see select_fields) for the duration of a with block.
+        
+        The parser's artifacts are restored on exit, so a projection does not
+        leak into later extractions from the same (e.g. pooled) parser, nor
+        into the document-level results they memoize.
+        
+        Args:
+            fields: Output fields to compute; all if None
+        
+        Yields:
+            List[str]: Selected field names in output order
+        """
+        previous = set(self.parser.artifacts)
+        try:
+            yield self.select_fields(fields)
+        finally:
+            self.parser.artifacts = previous
+    
+    def extract_fields(self, producers: Dict[str, Callable[[], Any]],
+                       fields: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+        """Compute the selected output fields, calling only their producers.
+        
+        Args:
+            producers: Zero-argument callables computing each field, keyed by
+                field name
+            fields: Output fields to compute; all if None
+            
+        Returns:
+            Dict[str, Any]: Values of the selected fields
+        """
+        with self.projection(fields) as selected:
+            return {name: producers[name]() for name in selected}
+    
+    def extract_stream(self, early_stop: Union[bool, Iterable[str]] = False,
+                       fields: Optional[Iterable[str]] = None, **kwargs) -> Dict[str, Any]:
+        """Extract data by consuming the parser's page stream incrementally.
+        
+        Only one page's words, tables and images are held at a time, so memory
+        stays flat regardless of document length. Extractors opt in by
+        implementing _begin_stream, _consume_page and _end_stream.
+        
+        Args:
+            early_stop: Stop reading pages once these fields are found; True
+                uses the extractor's EARLY_STOP_FIELDS. Results then only
+                reflect the pages read.
+            fields: Output fields to return (see FIELDS); all if None. Pages
+                are only scanned for the artifacts these fields need
+            **kwargs: Additional parameters for extraction
+            
+        Returns:
+            Dict[str, Any]: Extracted data
+        """
+        if early_stop is True:
+            needed = set(self.EARLY_STOP_FIELDS)
+        else:
+            needed = set(early_stop or ())
+        
+        with self.projection(fields) as selected:
+            state = self._begin_stream(**kwargs)
+            for page in self.parser.iter_pages():
+                self._consume_page(state, page)
+                if needed and needed.issubset(self._found_fields(state)):
+                    break
+            results = self._end_stream(state)
+        return results if fields is None else {name: results[name] for name in selected}
+    
+    def _found_fields(self, state: Dict[str, Any]) -> Set[str]:
+        """Names of the fields already found in the streaming state."""
+        return set()
+    
+    def _begin_stream(self, **kwargs) -> Dict[str, Any]:
+        """Create the state carried between streamed pages."""
+        raise NotImplementedError(f"{type(self).__name__} does not support streaming extraction")
+    
+    def _consume_page(self, state: Dict[str, Any], page: Dict[str, Any]):
+        """Fold one page record from BaseParser.iter_pages into the state."""
+        raise NotImplementedError(f"{type(self).__name__} does not support streaming extraction")
+    
+    def _end_stream(self, state: Dict[str, Any]) -> Dict[str, Any]:
+        """Turn the final streaming state into extraction results."""
+        raise NotImplementedError(f"{type(self).__name__} does not support streaming extraction")
+    
     def find_pattern(self, pattern: str, text: str) -> List[str]:
         """Find all occurrences of a regex pattern in text.
         
@@ -38,6 +221,7 @@ class BaseExtractor(ABC):
         """
         return re.findall(pattern, text)
     
+    @timed('extractor.extract_tables_by_keyword')
     def extract_tables_by_keyword(self, keyword: str) -> List[Dict[str, Any]]:
         """Extract tables that contain a specific keyword.
         
@@ -47,7 +231,23 @@ class BaseExtractor(ABC):
         Returns:
             List[Dict[str, Any]]: List of matching tables with metadata
         """
-        tables = self.parser.extract_tables()
+        return list(self.table_index().lookup(keyword))
+    
+    def table_index(self) -> TableIndex:
+        """Keyword index over the document's tables, built once per parser."""
+        return self.parser.cache.get_or_compute(
+            ('table_index',), lambda: TableIndex(self.parser.extract_tables())
+        )
+    
+    def section_index(self) -> SectionIndex:
+        """Index of the document's text sections, built once per parser."""
+        return self.parser.cache.get_or_compute(
+            ('section_index',), lambda: SectionIndex(self.parser.extract_text())
+        )
+    
+    @staticmethod
+    def _filter_tables_by_keyword(tables: Iterable[Dict[str, Any]], keyword: str) -> List[Dict[str, Any]]:
+        """Keep the tables having a cell that contains keyword (case-insensitive)."""
         matching_tables = []
         
         for table_data in tables:
@@ -59,6 +259,7 @@ class BaseExtractor(ABC):
         
         return matching_tables
     
+    @timed('extractor.extract_text_by_section')
     def extract_text_by_section(self, section_header: str) -> Optional[str]:
         """Extract text from a specific section of the document.
         
@@ -68,14 +269,51 @@ class BaseExtractor(ABC):
         Returns:
             Optional[str]: Section text if found, None otherwise
         """
-        text = self.parser.extract_text()
-        sections = text.split('\n\n')
+        # The section after the first one mentioning the header, or that
+        # section itself if it is the last
+        return self.section_index().section(section_header)
+
+class SectionStream:
+    """Incremental counterpart of BaseExtractor.extract_text_by_section.
+    
+    Fed the text of each streamed page in order, it resolves every header to
+    the section following the first section that mentions it, exactly as a
+    lookup over the joined document text would.
+    """
+    
+    def __init__(self, headers: Iterable[str]):
+        self._pending = {header: header.lower() for header in headers}
+        self._open: Dict[str, str] = {}
+        self.sections: Dict[str, str] = {}
+    
+    def feed(self, text: str):
+        """Consume the next chunk of document text.
         
-        for i, section in enumerate(sections):
-            if section_header.lower() in section.lower():
-                # Return the next section if it exists
-                if i + 1 < len(sections):
-                    return sections[i + 1].strip()
-                return section.strip()
+        Args:
+            text: Page text; chunks are treated as separated by a blank line
+        """
+        if not text:
+            # Pages without text are left out of the joined document text
+            return
+        for section in text.split('\n\n'):
+            # Headers seen in the previous section resolve to this one
+            for header in self._open:
+                self.sections[header] = section.strip()
+            self._open = {}
+            
+            lowered = section.lower()
+            for header, needle in list(self._pending.items()):
+                if needle in lowered:
+                    self._open[header] = section.strip()
+                    del self._pending[header]
+    
+    def close(self) -> Dict[str, str]:
+        """Finish the stream and return the resolved sections.
         
-        return None 
\ No newline at end of file
+        Returns:
+            Dict[str, str]: Section text keyed by header, for headers that were found
+        """
+        # A header in the final section resolves to that section itself
+        self.sections.update(self._open)
+        self._open = {}
+        return self.sections
\ No newline at end of file
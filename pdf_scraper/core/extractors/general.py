@@ -1,6 +1,8 @@
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Iterable, Set
 import re
+from ..parsers.timing import timed
 from .base import BaseExtractor
+from .references import iter_references
 
 class GeneralExtractor(BaseExtractor):
     """General-purpose extractor for various types of PDFs."""
@@ -19,51 +21,134 @@ class GeneralExtractor(BaseExtractor):
         'table_header': r'^(?:[A-Z][A-Za-z\s]+(?:\t|\s{2,})[A-Z][A-Za-z\s]+)+$'
     }
     
-    def extract(self, **kwargs) -> Dict[str, Any]:
+    # Patterns collected over the whole text for document and contact info
+    SCAN_PATTERNS = ('date', 'email', 'phone', 'url', 'currency', 'percentage')
+    
+    # Output fields and the page artifacts each is computed from
+    FIELDS = {
+        'metadata': (),
+        'document_info': ('words',),
+        'content_structure': ('words',),
+        'tables': ('tables',),
+        'lists': ('words',),
+        'references': ('words',),
+        'contact_info': ('words',)
+    }
+    
+    # Output field types (see BaseExtractor.SCHEMA)
+    SCHEMA = {
+        'metadata': BaseExtractor.METADATA_SCHEMA,
+        'document_info': dict.fromkeys(('dates', 'emails', 'urls', 'currencies', 'percentages'), ['str']),
+        'content_structure': {'headings': ['str'], 'sections': [{'heading': 'str', 'content': 'str'}]},
+        # Rows are dicts keyed by header where the headers line up, else lists
+        'tables': [{'page': 'int', 'headers': ['str'], 'data': 'json', 'bbox': ['float']}],
+        'lists': [{'type': 'str', 'items': ['str']}],
+        'references': [{'text': 'str', 'url': 'str'}],
+        'contact_info': dict.fromkeys(('emails', 'phones', 'urls'), ['str'])
+    }
+    
+    def extract(self, fields: Optional[Iterable[str]] = None, **kwargs) -> Dict[str, Any]:
         """Extract data from any PDF document.
         
+        Args:
+            fields: Output fields to compute (see FIELDS); all if None. Unrequested
+                fields, and the text layout or table detection only they need,
+                are never run
+        
         Returns:
             Dict[str, Any]: Extracted document data
         """
-        text = self.parser.extract_text()
-        metadata = self.parser.extract_metadata()
+        # Text is laid out on first use and then cached by the parser
+        text = self.parser.extract_text
         
         # Extract document structure and content
-        results = {
-            'metadata': metadata,
-            'document_info': self._extract_document_info(text),
-            'content_structure': self._extract_structure(text),
-            'tables': self._extract_tables(),
-            'lists': self._extract_lists(text),
-            'references': self._extract_references(text),
-            'contact_info': self._extract_contact_info(text)
+        producers = {
+            'metadata': self.parser.extract_metadata,
+            'document_info': lambda: self._extract_document_info(text()),
+            'content_structure': lambda: self._extract_structure(text()),
+            'tables': self._extract_tables,
+            'lists': lambda: self._extract_lists(text()),
+            'references': lambda: self._extract_references(text()),
+            'contact_info': lambda: self._extract_contact_info(text())
+        }
+        
+        return self.extract_fields(producers, fields)
+    
+    def _begin_stream(self, **kwargs) -> Dict[str, Any]:
+        """Start a streaming extraction."""
+        return {
+            'document_info': {},
+            'content_structure': {'headings': [], 'sections': []},
+            'structure_state': {'heading': None, 'lines': []},
+            'tables': [],
+            'lists': [],
+            'list_state': {'type': None, 'items': []},
+            'references': [],
+            'contact_info': {}
         }
+    
+    def _consume_page(self, state: Dict[str, Any], page: Dict[str, Any]):
+        """Fold one streamed page into the extraction state."""
+        text = page['text']
+        lines = text.split('\n')
         
-        return results
+        for key, values in self._extract_document_info(text).items():
+            state['document_info'].setdefault(key, []).extend(values)
+        self._scan_structure(lines, state['content_structure'], state['structure_state'])
+        state['tables'].extend(self._extract_tables(page.get('tables') or []))
+        self._scan_lists(lines, state['lists'], state['list_state'])
+        state['references'].extend(self._extract_references(text))
+        for key, values in self._extract_contact_info(text).items():
+            state['contact_info'].setdefault(key, []).extend(values)
+    
+    def _found_fields(self, state: Dict[str, Any]) -> Set[str]:
+        """Document info and contact info fields found so far (e.g. 'emails')."""
+        return set(state['document_info']) | set(state['contact_info'])
     
+    def _end_stream(self, state: Dict[str, Any]) -> Dict[str, Any]:
+        """Assemble results from the final streaming state."""
+        self._close_section(state['content_structure'], state['structure_state'])
+        self._close_list(state['lists'], state['list_state'])
+        return {
+            'metadata': self.parser.extract_metadata(),
+            'document_info': state['document_info'],
+            'content_structure': state['content_structure'],
+            'tables': state['tables'],
+            'lists': state['lists'],
+            'references': state['references'],
+            'contact_info': state['contact_info']
+        }
+    
+    @timed('extractor._extract_document_info')
     def _extract_document_info(self, text: str) -> Dict[str, Any]:
         """Extract basic document information."""
+        matches = self.scan_patterns(text)
         info = {
-            'dates': self.find_pattern(self.PATTERNS['date'], text),
-            'emails': self.find_pattern(self.PATTERNS['email'], text),
-            'urls': self.find_pattern(self.PATTERNS['url'], text),
-            'currencies': self.find_pattern(self.PATTERNS['currency'], text),
-            'percentages': self.find_pattern(self.PATTERNS['percentage'], text)
+            'dates': list(matches['date']),
+            'emails': list(matches['email']),
+            'urls': list(matches['url']),
+            'currencies': list(matches['currency']),
+            'percentages': list(matches['percentage'])
         }
         return {k: v for k, v in info.items() if v}  # Remove empty lists
     
+    @timed('extractor._extract_structure')
     def _extract_structure(self, text: str) -> Dict[str, Any]:
         """Extract document structure including headings and sections."""
         structure = {
             'headings': [],
             'sections': []
         }
+        state = {'heading': None, 'lines': []}
         
         # Split text into lines and process
-        lines = text.split('\n')
-        current_section = []
-        current_heading = None
+        self._scan_structure(text.split('\n'), structure, state)
+        self._close_section(structure, state)
         
+        return structure
+    
+    def _scan_structure(self, lines: Iterable[str], structure: Dict[str, Any], state: Dict[str, Any]):
+        """Feed lines into the heading/section state, appending completed sections."""
         for line in lines:
             line = line.strip()
             if not line:
@@ -73,30 +158,27 @@ class GeneralExtractor(BaseExtractor):
             heading_match = re.match(self.PATTERNS['heading'], line)
             if heading_match:
                 # Save previous section if exists
-                if current_heading and current_section:
-                    structure['sections'].append({
-                        'heading': current_heading,
-                        'content': '\n'.join(current_section)
-                    })
-                current_heading = heading_match.group(0).rstrip(':.')
-                structure['headings'].append(current_heading)
-                current_section = []
+                self._close_section(structure, state)
+                state['heading'] = heading_match.group(0).rstrip(':.')
+                structure['headings'].append(state['heading'])
+                state['lines'] = []
             else:
-                current_section.append(line)
-        
-        # Add the last section
-        if current_heading and current_section:
+                state['lines'].append(line)
+    
+    def _close_section(self, structure: Dict[str, Any], state: Dict[str, Any]):
+        """Append the section being collected, if it has a heading and content."""
+        if state['heading'] and state['lines']:
             structure['sections'].append({
-                'heading': current_heading,
-                'content': '\n'.join(current_section)
+                'heading': state['heading'],
+                'content': '\n'.join(state['lines'])
             })
-        
-        return structure
     
-    def _extract_tables(self) -> List[Dict[str, Any]]:
-        """Extract and validate tables from the document."""
+    @timed('extractor._extract_tables')
+    def _extract_tables(self, table_data: Optional[List[Dict[str, Any]]] = None) -> List[Dict[str, Any]]:
+        """Extract and validate tables from the document (or from table_data if given)."""
         tables = []
-        table_data = self.parser.extract_tables()
+        if table_data is None:
+            table_data = self.parser.extract_tables()
         
         for table in table_data:
             if not table['table'] or len(table['table']) < 2:
@@ -137,13 +219,20 @@ class GeneralExtractor(BaseExtractor):
         
         return tables
     
+    @timed('extractor._extract_lists')
     def _extract_lists(self, text: str) -> List[Dict[str, Any]]:
         """Extract lists from the document."""
         lists = []
-        current_list = []
-        current_list_type = None
+        state = {'type': None, 'items': []}
+        
+        self._scan_lists(text.split('\n'), lists, state)
+        self._close_list(lists, state)
         
-        for line in text.split('\n'):
+        return lists
+    
+    def _scan_lists(self, lines: Iterable[str], lists: List[Dict[str, Any]], state: Dict[str, Any]):
+        """Feed lines into the list state, appending completed lists."""
+        for line in lines:
             line = line.strip()
             if not line:
                 continue
@@ -152,66 +241,57 @@ class GeneralExtractor(BaseExtractor):
             list_match = re.match(self.PATTERNS['list_item'], line)
             if list_match:
                 # Save previous list if exists
-                if current_list:
-                    lists.append({
-                        'type': current_list_type,
-                        'items': current_list
-                    })
+                self._close_list(lists, state)
                 
                 # Start new list
-                current_list = []
+                state['items'] = []
                 if line.startswith(('*', '-', '•')):
-                    current_list_type = 'bullet'
+                    state['type'] = 'bullet'
                 else:
-                    current_list_type = 'numbered'
+                    state['type'] = 'numbered'
                 
                 # Add item without the marker
                 item = re.sub(r'^(?:\d+\.|\*|\-|\•)\s+', '', line)
-                current_list.append(item)
-            elif current_list:
+                state['items'].append(item)
+            elif state['items']:
                 # Continue current list
-                current_list.append(line)
-        
-        # Add the last list
-        if current_list:
+                state['items'].append(line)
+    
+    def _close_list(self, lists: List[Dict[str, Any]], state: Dict[str, Any]):
+        """Append the list being collected, if any."""
+        if state['items']:
             lists.append({
-                'type': current_list_type,
-                'items': current_list
+                'type': state['type'],
+                'items': state['items']
             })
-        
-        return lists
     
+    @timed('extractor._extract_references')
     def _extract_references(self, text: str) -> List[Dict[str, str]]:
         """Extract references and citations from the document."""
         references = []
+        url_pattern = self.pattern_scanner().patterns['url']
         
-        # Look for common reference patterns
-        ref_patterns = [
-            r'\[\d+\].*?(?=\[\d+\]|$)',  # [1] style
-            r'\(\d{4}\)[^)]*',  # (2023) style
-            r'[A-Z][a-z]+ et al\., \d{4}',  # Author et al., 2023 style
-            r'https?://[^\s]+'  # URLs
-        ]
-        
-        for pattern in ref_patterns:
-            matches = re.finditer(pattern, text)
-            for match in matches:
-                ref_text = match.group(0).strip()
-                if ref_text:
-                    # Try to extract URL if present
-                    url_match = re.search(self.PATTERNS['url'], ref_text)
-                    references.append({
-                        'text': ref_text,
-                        'url': url_match.group(0) if url_match else None
-                    })
+        # [1] style references are found by a linear scan rather than a lazy
+        # regex; see iter_references for the other styles
+        for ref_text in iter_references(text, self.LINEAR_REGEX):
+            ref_text = ref_text.strip()
+            if ref_text:
+                # Try to extract URL if present
+                url_match = url_pattern.search(ref_text)
+                references.append({
+                    'text': ref_text,
+                    'url': url_match.group(0) if url_match else None
+                })
         
         return references
     
+    @timed('extractor._extract_contact_info')
     def _extract_contact_info(self, text: str) -> Dict[str, List[str]]:
         """Extract contact information from the document."""
+        matches = self.scan_patterns(text)
         contact_info = {
-            'emails': self.find_pattern(self.PATTERNS['email'], text),
-            'phones': self.find_pattern(self.PATTERNS['phone'], text),
-            'urls': self.find_pattern(self.PATTERNS['url'], text)
+            'emails': list(matches['email']),
+            'phones': list(matches['phone']),
+            'urls': list(matches['url'])
         }
         return {k: v for k, v in contact_info.items() if v}  # Remove empty lists 
\ No newline at end of file
@@ -0,0 +1,123 @@
+from typing import Dict, List, Any, Iterable, Optional
+from bisect import bisect_right
+
+# Joins indexed pieces; search keys never contain it, so matches cannot span pieces
+_SEPARATOR = '\x00'
+
+class _PieceIndex:
+    """Lower-cased pieces of text joined into one string, searched with str.find.
+    
+    A lookup is one C-level substring search over the joined string plus a
+    binary search over piece start offsets, instead of lower-casing and
+    scanning every piece in Python.
+    """
+    
+    def __init__(self, pieces: Iterable[str]):
+        lowered = [piece.lower() for piece in pieces]
+        self._starts = []
+        offset = 0
+        for piece in lowered:
+            self._starts.append(offset)
+            offset += len(piece) + len(_SEPARATOR)
+        self._joined = _SEPARATOR.join(lowered)
+    
+    def _piece_at(self, position: int) -> int:
+        return bisect_right(self._starts, position) - 1
+    
+    def first(self, needle: str) -> Optional[int]:
+        """Index of the first piece containing needle (already lower-cased)."""
+        if not self._starts:
+            return None
+        position = self._joined.find(needle)
+        return self._piece_at(position) if position >= 0 else None
+
+class SectionIndex:
+    """Per-document index of blank-line separated text sections.
+    
+    Resolves a header to its section as BaseExtractor.extract_text_by_section
+    always has: the section after the first one mentioning the header,
+    case-insensitively, or that section itself if it is the last. Results
+    are memoized by normalized header.
+    """
+    
+    def __init__(self, text: str):
+        """Build the index.
+        
+        Args:
+            text: Document text, sections separated by blank lines
+        """
+        self.sections = text.split('\n\n')
+        self._pieces = _PieceIndex(self.sections)
+        self._resolved: Dict[str, Optional[str]] = {}
+    
+    def section(self, header: str) -> Optional[str]:
+        """Look up the section belonging to a header.
+        
+        Args:
+            header: Header text, matched case-insensitively anywhere in a section
+        
+        Returns:
+            Optional[str]: Section text if the header was found, None otherwise
+        """
+        key = header.lower()
+        if key not in self._resolved:
+            index = None if _SEPARATOR in key else self._pieces.first(key)
+            if index is None:
+                self._resolved[key] = None
+            else:
+                self._resolved[key] = self.sections[min(index + 1, len(self.sections) - 1)].strip()
+        return self._resolved[key]
+
+class TableIndex:
+    """Per-document index of table cell text for keyword lookups.
+    
+    Matches BaseExtractor._filter_tables_by_keyword: a table matches if any
+    of its cells contains the keyword, case-insensitively. Results are
+    memoized by normalized keyword.
+    """
+    
+    def __init__(self, tables: Iterable[Dict[str, Any]]):
+        """Build the index.
+        
+        Args:
+            tables: Tables as returned by BaseParser.extract_tables
+        """
+        self.tables = list(tables)
+        # One piece per cell, so a keyword never matches across cells
+        self._cell_tables: List[int] = []
+        cells = []
+        for table_index, table_data in enumerate(self.tables):
+            for row in table_data["table"]:
+                for cell in row:
+                    cells.append(str(cell))
+                    self._cell_tables.append(table_index)
+        self._pieces = _PieceIndex(cells)
+        self._matches: Dict[str, List[Dict[str, Any]]] = {}
+    
+    def lookup(self, keyword: str) -> List[Dict[str, Any]]:
+        """Find the tables with a cell containing keyword.
+        
+        Args:
+            keyword: Keyword to search for, case-insensitively
+        
+        Returns:
+            List[Dict[str, Any]]: Matching tables in document order
+        """
+        key = keyword.lower()
+        if key not in self._matches:
+            self._matches[key] = [] if _SEPARATOR in key else [self.tables[i] for i in self._find_tables(key)]
+        return self._matches[key]
+    
+    def _find_tables(self, key: str) -> List[int]:
+        joined, starts = self._pieces._joined, self._pieces._starts
+        found = []
+        position = joined.find(key) if starts else -1
+        while position >= 0:
+            table_index = self._cell_tables[self._pieces._piece_at(position)]
+            found.append(table_index)
+            # Resume at the first cell of the next table
+            next_cell = bisect_right(self._cell_tables, table_index)
+            if next_cell >= len(starts):
+                break
+            position = joined.find(key, starts[next_cell])
+        return found
\ No newline at end of file
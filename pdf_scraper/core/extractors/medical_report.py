@@ -1,6 +1,7 @@
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Iterable, Optional, Set
 import re
-from .base import BaseExtractor
+from ..parsers.timing import timed
+from .base import BaseExtractor, SectionStream
 
 class MedicalReportExtractor(BaseExtractor):
     """Extractor specialized for medical reports."""
@@ -14,7 +15,10 @@ class MedicalReportExtractor(BaseExtractor):
         'patient_id': r'\b(?:Patient ID|MRN|Medical Record Number):?\s*([A-Z0-9-]+)\b',
         'blood_values': r'\b(?:WBC|RBC|HGB|HCT|PLT|White Blood Cells|Red Blood Cells|Hemoglobin|Hematocrit|Platelets):?\s*(\d+\.?\d*)\s*(?:K/µL|M/µL|g/dL|%|K/µL)?\b'
     }
-
+    
+    # Patterns collected in one pass over the text for patient info and vital signs
+    SCAN_PATTERNS = ('patient_id', 'date', 'blood_pressure', 'heart_rate', 'temperature')
+    
     # Validation ranges for vital signs
     VALIDATION_RANGES = {
         'blood_pressure': {
@@ -31,39 +35,121 @@ class MedicalReportExtractor(BaseExtractor):
             'PLT': (150, 450)
         }
     }
-
-    def extract(self, **kwargs) -> Dict[str, Any]:
+    
+    # Header fields that almost always sit on the first page; triage runs stop
+    # reading once both are found
+    EARLY_STOP_FIELDS = ('patient_id', 'date')
+    
+    # Output fields and the page artifacts each is computed from
+    FIELDS = {
+        'metadata': (),
+        'patient_info': ('words',),
+        'vital_signs': ('words',),
+        'lab_results': ('tables',),
+        'diagnoses': ('words',),
+        'medications': ('words',)
+    }
+    
+    # Output field types (see BaseExtractor.SCHEMA)
+    SCHEMA = {
+        'metadata': BaseExtractor.METADATA_SCHEMA,
+        'patient_info': {'patient_id': 'str', 'date': 'str'},
+        'vital_signs': {
+            'blood_pressure': {'systolic': 'int', 'diastolic': 'int'},
+            'heart_rate': 'int',
+            'temperature': 'float'
+        },
+        'lab_results': dict.fromkeys(VALIDATION_RANGES['blood_values'], 'str'),
+        'diagnoses': ['str'],
+        'medications': [{'name': 'str', 'dosage': 'str', 'frequency': 'str'}]
+    }
+    
+    # Table keywords and section headers the report sections are found by
+    LAB_SECTIONS = ['Laboratory Results', 'Lab Results', 'Blood Work', 'Lab Values']
+    DIAGNOSIS_SECTIONS = ['Diagnosis', 'Diagnoses', 'Assessment', 'Impression']
+    MEDICATION_SECTIONS = ['Medications', 'Medication List', 'Current Medications', 'Prescriptions']
+    
+    def extract(self, fields: Optional[Iterable[str]] = None, **kwargs) -> Dict[str, Any]:
         """Extract medical data from the PDF.
         
+        Args:
+            fields: Output fields to compute (see FIELDS); all if None. Unrequested
+                fields, and the text layout or table detection only they need,
+                are never run
+        
         Returns:
             Dict[str, Any]: Extracted medical data
         """
-        text = self.parser.extract_text()
-        metadata = self.parser.extract_metadata()
-        
-        # Extract basic information
-        results = {
-            'metadata': metadata,
-            'patient_info': self._extract_patient_info(text),
-            'vital_signs': self._extract_vital_signs(text),
-            'lab_results': self._extract_lab_results(),
-            'diagnoses': self._extract_diagnoses(text),
-            'medications': self._extract_medications(text)
+        # Text is laid out on first use and then cached by the parser
+        text = self.parser.extract_text
+        
+        producers = {
+            'metadata': self.parser.extract_metadata,
+            'patient_info': lambda: self._extract_patient_info(text()),
+            'vital_signs': lambda: self._extract_vital_signs(text()),
+            'lab_results': self._extract_lab_results,
+            'diagnoses': lambda: self._extract_diagnoses(text()),
+            'medications': lambda: self._extract_medications(text())
         }
         
-        return results
+        return self.extract_fields(producers, fields)
+    
+    def _begin_stream(self, **kwargs) -> Dict[str, Any]:
+        """Start a streaming extraction."""
+        return {
+            'patient_info': {},
+            'vital_signs': {},
+            'lab_results': {},
+            'sections': SectionStream(self.DIAGNOSIS_SECTIONS + self.MEDICATION_SECTIONS)
+        }
     
+    def _consume_page(self, state: Dict[str, Any], page: Dict[str, Any]):
+        """Fold one streamed page into the extraction state."""
+        text = page['text']
+        
+        # The first occurrence in the document wins, as with a full-text search
+        for key, value in self._extract_patient_info(text).items():
+            state['patient_info'].setdefault(key, value)
+        for key, value in self._extract_vital_signs(text).items():
+            state['vital_signs'].setdefault(key, value)
+        
+        tables = page.get('tables') or []
+        self._parse_lab_tables(
+            (table for section in self.LAB_SECTIONS for table in self._filter_tables_by_keyword(tables, section)),
+            state['lab_results']
+        )
+        
+        state['sections'].feed(text)
+    
+    def _found_fields(self, state: Dict[str, Any]) -> Set[str]:
+        """Patient info and vital sign fields found so far."""
+        return set(state['patient_info']) | set(state['vital_signs'])
+    
+    def _end_stream(self, state: Dict[str, Any]) -> Dict[str, Any]:
+        """Assemble results from the final streaming state."""
+        sections = state['sections'].close()
+        return {
+            'metadata': self.parser.extract_metadata(),
+            'patient_info': state['patient_info'],
+            'vital_signs': state['vital_signs'],
+            'lab_results': state['lab_results'],
+            'diagnoses': self._parse_diagnoses(sections.get(s) for s in self.DIAGNOSIS_SECTIONS),
+            'medications': self._parse_medications(sections.get(s) for s in self.MEDICATION_SECTIONS)
+        }
+    
+    @timed('extractor._extract_patient_info')
     def _extract_patient_info(self, text: str) -> Dict[str, str]:
         """Extract patient information."""
         info = {}
         
         # Extract patient ID
-        patient_id = self.find_pattern(self.PATTERNS['patient_id'], text)
+        matches = self.scan_patterns(text)
+        patient_id = matches['patient_id']
         if patient_id:
             info['patient_id'] = patient_id[0]
         
         # Extract date
-        date = self.find_pattern(self.PATTERNS['date'], text)
+        date = matches['date']
         if date:
             info['date'] = date[0]
         
@@ -82,13 +168,15 @@ class MedicalReportExtractor(BaseExtractor):
                 min_val, max_val = self.VALIDATION_RANGES[name]
                 return min_val <= value <= max_val
         return False
-
+    
+    @timed('extractor._extract_vital_signs')
     def _extract_vital_signs(self, text: str) -> Dict[str, Any]:
         """Extract and validate vital signs."""
         vitals = {}
         
         # Extract blood pressure with validation
-        bp = self.find_pattern(self.PATTERNS['blood_pressure'], text)
+        matches = self.scan_patterns(text)
+        bp = matches['blood_pressure']
         if bp:
             bp_value = {
                 'systolic': int(bp[0][0]),
@@ -98,14 +186,14 @@ class MedicalReportExtractor(BaseExtractor):
                 vitals['blood_pressure'] = bp_value
         
         # Extract heart rate with validation
-        hr = self.find_pattern(self.PATTERNS['heart_rate'], text)
+        hr = matches['heart_rate']
         if hr:
             hr_value = int(hr[0])
             if self._validate_vital_sign('heart_rate', hr_value):
                 vitals['heart_rate'] = hr_value
         
         # Extract temperature with validation
-        temp = self.find_pattern(self.PATTERNS['temperature'], text)
+        temp = matches['temperature']
         if temp:
             temp_value = float(temp[0])
             if self._validate_vital_sign('temperature', temp_value):
@@ -113,46 +201,53 @@ class MedicalReportExtractor(BaseExtractor):
         
         return vitals
     
+    @timed('extractor._extract_lab_results')
     def _extract_lab_results(self) -> Dict[str, Any]:
         """Extract and validate laboratory results from tables."""
-        lab_results = {}
-        
         # Look for common lab result tables with improved section detection
-        lab_sections = ['Laboratory Results', 'Lab Results', 'Blood Work', 'Lab Values']
-        for section in lab_sections:
-            lab_tables = self.extract_tables_by_keyword(section)
-            if lab_tables:
-                for table_data in lab_tables:
-                    table = table_data['table']
-                    # Skip empty tables or tables without headers
-                    if not table or len(table) < 2:
-                        continue
+        return self._parse_lab_tables(
+            table for section in self.LAB_SECTIONS for table in self.extract_tables_by_keyword(section)
+        )
+    
+    def _parse_lab_tables(self, tables: Iterable[Dict[str, Any]], lab_results: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Collect validated lab values from lab result tables into lab_results."""
+        if lab_results is None:
+            lab_results = {}
+        
+        for table_data in tables:
+            table = table_data['table']
+            # Skip empty tables or tables without headers
+            if not table or len(table) < 2:
+                continue
+            
+            # Process table rows with validation
+            headers = [str(h).strip().upper() for h in table[0]]
+            for row in table[1:]:
+                if len(row) >= 2:
+                    test_name = str(row[0]).strip().upper()
+                    value = str(row[1]).strip()
                     
-                    # Process table rows with validation
-                    headers = [str(h).strip().upper() for h in table[0]]
-                    for row in table[1:]:
-                        if len(row) >= 2:
-                            test_name = str(row[0]).strip().upper()
-                            value = str(row[1]).strip()
-                            
-                            # Validate test name and value
-                            if test_name and value and test_name in self.VALIDATION_RANGES['blood_values']:
-                                try:
-                                    num_value = float(value.split()[0])  # Extract numeric part
-                                    if self._validate_vital_sign('blood_values', num_value):
-                                        lab_results[test_name] = value
-                                except (ValueError, IndexError):
-                                    continue
+                    # Validate test name and value
+                    if test_name and value and test_name in self.VALIDATION_RANGES['blood_values']:
+                        try:
+                            num_value = float(value.split()[0])  # Extract numeric part
+                            if self._validate_vital_sign('blood_values', num_value):
+                                lab_results[test_name] = value
+                        except (ValueError, IndexError):
+                            continue
         
         return lab_results
     
+    @timed('extractor._extract_diagnoses')
     def _extract_diagnoses(self, text: str) -> List[str]:
         """Extract and validate diagnoses from the report."""
+        return self._parse_diagnoses(self.extract_text_by_section(s) for s in self.DIAGNOSIS_SECTIONS)
+    
+    def _parse_diagnoses(self, section_texts: Iterable[Optional[str]]) -> List[str]:
+        """Parse diagnosis items out of diagnosis section texts."""
         diagnoses = []
-        diagnosis_sections = ['Diagnosis', 'Diagnoses', 'Assessment', 'Impression']
         
-        for section in diagnosis_sections:
-            section_text = self.extract_text_by_section(section)
+        for section_text in section_texts:
             if section_text:
                 # Split by common delimiters and clean up
                 items = re.split(r'[•\-\*]', section_text)
@@ -167,13 +262,16 @@ class MedicalReportExtractor(BaseExtractor):
         
         return list(set(diagnoses))  # Remove duplicates
     
+    @timed('extractor._extract_medications')
     def _extract_medications(self, text: str) -> List[Dict[str, str]]:
         """Extract and validate medication information."""
+        return self._parse_medications(self.extract_text_by_section(s) for s in self.MEDICATION_SECTIONS)
+    
+    def _parse_medications(self, section_texts: Iterable[Optional[str]]) -> List[Dict[str, str]]:
+        """Parse medication details out of medication section texts."""
         medications = []
-        med_sections = ['Medications', 'Medication List', 'Current Medications', 'Prescriptions']
         
-        for section in med_sections:
-            med_section = self.extract_text_by_section(section)
+        for med_section in section_texts:
             if med_section:
                 # Split by common delimiters and clean up
                 items = re.split(r'[•\-\*]', med_section)
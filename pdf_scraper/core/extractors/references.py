@@ -0,0 +1,73 @@
+from typing import Any, Dict, Iterator, List
+import re
+from .scanner import compile_pattern
+
+# A numbered citation marker such as [12]
+_MARKER = re.compile(r'\[\d+\]')
+
+# Reference styles without open-ended bodies; each is a single greedy pass
+OTHER_REFERENCE_PATTERNS = [
+    r'\(\d{4}\)[^)]*',  # (2023) style
+    r'[A-Z][a-z]+ et al\., \d{4}',  # Author et al., 2023 style
+    r'https?://[^\s]+'  # URLs
+]
+
+def iter_bracket_references(text: str) -> Iterator[str]:
+    """Find [1] style references in one left-to-right pass.
+    
+    Yields what re.finditer(r'\\[\\d+\\].*?(?=\\[\\d+\\]|$)', text) matches:
+    each marker up to the next marker on the same line; the last marker on
+    a line only if that is the final line, up to the end of the text. The
+    lazy pattern retries its lookahead at every character, and restarts
+    after every marker whose line ends without another one. Here the text
+    is instead tokenized into markers once, and each gap between markers
+    is checked for a line break once, so the time taken is linear in the
+    length of the text.
+    
+    Args:
+        text: Text to scan
+    
+    Yields:
+        str: Reference text, starting with its marker
+    """
+    length = len(text)
+    # Where a trailing $ may match: the end, or before a final newline
+    text_end = length - 1 if text.endswith('\n') else length
+    
+    markers = _MARKER.finditer(text)
+    current = next(markers, None)
+    while current is not None:
+        following = next(markers, None)
+        start, body = current.span()
+        if following is not None:
+            if text.find('\n', body, following.start()) < 0:
+                yield text[start:following.start()]
+        elif text.find('\n', body, text_end) < 0:
+            # The last marker runs to the end if it is on the last line
+            yield text[start:text_end]
+        current = following
+
+def iter_references(text: str, linear_regex: bool = False) -> Iterator[str]:
+    """Find reference and citation texts, style by style.
+    
+    Args:
+        text: Text to scan
+        linear_regex: Match the remaining reference styles with the optional
+            linear-time engine (see compile_pattern)
+    
+    Yields:
+        str: Reference texts, all [1] style ones first, then (2023) style,
+            "et al." style and URLs, each in document order
+    """
+    yield from iter_bracket_references(text)
+    for pattern in _other_patterns(linear_regex):
+        for match in pattern.finditer(text):
+            yield match.group(0)
+
+# Compiled OTHER_REFERENCE_PATTERNS, keyed by whether the linear engine is used
+_compiled: Dict[bool, List[Any]] = {}
+
+def _other_patterns(linear_regex: bool) -> List[Any]:
+    if linear_regex not in _compiled:
+        _compiled[linear_regex] = [compile_pattern(p, linear=linear_regex) for p in OTHER_REFERENCE_PATTERNS]
+    return _compiled[linear_regex]
\ No newline at end of file
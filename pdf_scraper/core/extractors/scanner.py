@@ -0,0 +1,85 @@
+from typing import Dict, List, Any, Optional
+import re
+from ..parsers.timing import StageTimer
+
+try:
+    # Optional linear-time engine (google-re2); see compile_pattern
+    import re2
+except ImportError:
+    re2 = None
+
+# re flags RE2 accepts, as inline flag groups
+_RE2_FLAGS = {re.IGNORECASE: 'i', re.MULTILINE: 'm', re.DOTALL: 's'}
+
+def compile_pattern(pattern: str, flags: int = 0, linear: bool = False) -> Any:
+    """Compile a regex, optionally with the linear-time RE2 engine.
+    
+    RE2 never backtracks, so its matching time is linear in the text
+    whatever the pattern. It is used only when requested, installed, and
+    able to compile the pattern (it has no lookarounds or backreferences);
+    otherwise the pattern is compiled with re. Note that RE2's \b, \w and
+    \d are ASCII-only, where re's also match other Unicode letters and digits.
+    
+    Args:
+        pattern: Regular expression
+        flags: re flags; only IGNORECASE, MULTILINE and DOTALL can be used with RE2
+        linear: Prefer the linear-time engine
+    
+    Returns:
+        Any: Compiled pattern with the re.Pattern search methods
+    """
+    if linear and re2 is not None and not flags & ~sum(_RE2_FLAGS):
+        inline = ''.join(letter for flag, letter in _RE2_FLAGS.items() if flags & flag)
+        options = re2.Options()
+        # Unsupported patterns fall back to re without RE2 logging an error
+        options.log_errors = False
+        try:
+            return re2.compile(f'(?{inline}){pattern}' if inline else pattern, options)
+        except re2.error:
+            pass
+    return re.compile(pattern, flags)
+
+class PatternScanner:
+    """Finds the matches of several named regex patterns in a text at once.
+    
+    Patterns are compiled once, and a scan runs each of them exactly once
+    over the text. Results are tagged by pattern name, so the extraction
+    steps that need the same pattern share one set of matches.
+    
+    A single combined regex, with each pattern in a capturing lookahead,
+    was measured about three times slower than separate compiled scans in
+    CPython's re. It tries every pattern at every position and loses the
+    engine's literal-prefix search. The patterns are therefore scanned
+    separately.
+    """
+    
+    def __init__(self, patterns: Dict[str, str], flags: int = 0, linear: bool = False):
+        """Compile the patterns.
+        
+        Args:
+            patterns: Regular expressions keyed by name
+            flags: re flags applied to every pattern
+            linear: Compile with the linear-time engine where possible (see compile_pattern)
+        """
+        self.linear = linear
+        self.patterns = {name: compile_pattern(pattern, flags, linear) for name, pattern in patterns.items()}
+    
+    def scan(self, text: str, timer: Optional[StageTimer] = None) -> Dict[str, List[Any]]:
+        """Find all matches of every pattern.
+        
+        Args:
+            text: Text to scan
+            timer: Records the time of each pattern as stage 'pattern.<name>'
+        
+        Returns:
+            Dict[str, List[Any]]: re.findall results keyed by pattern name: the
+                matched strings, the group for single-group patterns, or group
+                tuples for patterns with several groups
+        """
+        if timer is None:
+            return {name: pattern.findall(text) for name, pattern in self.patterns.items()}
+        matches = {}
+        for name, pattern in self.patterns.items():
+            with timer.stage(f'pattern.{name}'):
+                matches[name] = pattern.findall(text)
+        return matches
\ No newline at end of file
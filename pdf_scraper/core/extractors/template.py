@@ -0,0 +1,314 @@
+from contextlib import contextmanager
+from typing import Dict, List, Any, Iterable, Iterator, Optional, Set, Tuple, Union
+import json
+import os
+import re
+import yaml
+from functools import partial
+from ..parsers.base import BaseParser, parse_page_range
+from .base import BaseExtractor, SectionStream
+from .scanner import PatternScanner
+
+class ExtractionTemplate:
+    """Declarative extraction template loaded from YAML or JSON.
+    
+    A template names the fields to extract and how to find each one::
+        
+        name: invoice
+        pages: "1-2"                # optional; all pages if omitted
+        early_stop: [invoice_number]  # pattern fields only
+        fields:
+          invoice_number:
+            pattern: 'Invoice\\s*#?\\s*([A-Z0-9-]+)'
+          total:
+            pattern: 'Total:?\\s*\\$?([\\d,]+\\.\\d{2})'
+            type: float
+          emails:
+            pattern: '[\\w.+-]+@[\\w-]+\\.[\\w.]+'
+            all: true               # every match instead of the first
+          notes:
+            section: Notes          # text of the section after the header
+          line_items:
+            table: Description      # tables with a cell containing the keyword
+          title:
+            metadata: title
+    
+    Templates compile into a parse plan: the page artifacts and pages the
+    parser must produce for these fields, and nothing else.
+    """
+    
+    FIELD_KINDS = ('pattern', 'section', 'table', 'metadata')
+    TYPES = {'str': str, 'int': int, 'float': float}
+    
+    # Page artifacts each field kind is computed from
+    KIND_ARTIFACTS = {'pattern': ('words',), 'section': ('words',), 'table': ('tables',), 'metadata': ()}
+    
+    def __init__(self, spec: Dict[str, Any], name: Optional[str] = None):
+        """Validate and compile a template specification.
+        
+        Args:
+            spec: Parsed template document
+            name: Template name used if the spec has none
+        """
+        if not isinstance(spec, dict) or not isinstance(spec.get('fields'), dict) or not spec['fields']:
+            raise ValueError("Template must define a non-empty 'fields' mapping")
+        self.name = spec.get('name') or name or 'template'
+        self.description = spec.get('description', '')
+        
+        pages = spec.get('pages')
+        self.pages = parse_page_range(str(pages)) if isinstance(pages, (str, int)) else (
+            sorted(set(pages)) if pages is not None else None
+        )
+        
+        self.fields: Dict[str, Dict[str, Any]] = {}
+        for field_name, field in spec['fields'].items():
+            self.fields[field_name] = self._compile_field(field_name, field)
+        
+        self.early_stop = tuple(spec.get('early_stop') or ())
+        unknown = set(self.early_stop) - set(self.fields)
+        if unknown:
+            raise ValueError(f"early_stop names unknown fields: {', '.join(sorted(unknown))}")
+        # Only pattern fields are known to be found while pages are read
+        unsupported = {n for n in self.early_stop if self.fields[n]['kind'] != 'pattern'}
+        if unsupported:
+            raise ValueError(f"early_stop names non-pattern fields: {', '.join(sorted(unsupported))}")
+        
+        self.ignore_case = bool(spec.get('ignore_case'))
+        patterns = {n: f['pattern'] for n, f in self.fields.items() if f['kind'] == 'pattern'}
+        self.scanner = PatternScanner(patterns, re.IGNORECASE if self.ignore_case else 0)
+    
+    def _compile_field(self, field_name: str, field: Any) -> Dict[str, Any]:
+        if isinstance(field, str):
+            # Shorthand: a bare string is a pattern
+            field = {'pattern': field}
+        kinds = [kind for kind in self.FIELD_KINDS if kind in (field or {})]
+        if len(kinds) != 1:
+            raise ValueError(f"Field '{field_name}' must define exactly one of: {', '.join(self.FIELD_KINDS)}")
+        field_type = field.get('type', 'str')
+        if field_type not in self.TYPES:
+            raise ValueError(f"Field '{field_name}' has unknown type '{field_type}'")
+        if kinds[0] == 'pattern':
+            try:
+                re.compile(field['pattern'])
+            except re.error as e:
+                raise ValueError(f"Field '{field_name}' has an invalid pattern: {e}")
+        return {
+            "kind": kinds[0],
+            kinds[0]: field[kinds[0]],
+            "all": bool(field.get('all', False)),
+            "type": field_type
+        }
+    
+    @classmethod
+    def load(cls, path: str) -> 'ExtractionTemplate':
+        """Load a template from a .yaml, .yml or .json file.
+        
+        Args:
+            path: Path to the template file
+        
+        Returns:
+            ExtractionTemplate: Compiled template
+        """
+        with open(path, 'r', encoding='utf-8') as f:
+            if path.lower().endswith('.json'):
+                spec = json.load(f)
+            else:
+                try:
+                    spec = yaml.safe_load(f)
+                except yaml.YAMLError as e:
+                    raise ValueError(f"Invalid YAML: {e}")
+        return cls(spec, name=os.path.splitext(os.path.basename(path))[0])
+    
+    def kinds(self) -> Set[str]:
+        """Field kinds used by the template."""
+        return {field['kind'] for field in self.fields.values()}
+    
+    def field_artifacts(self) -> Dict[str, Tuple[str, ...]]:
+        """Page artifacts each field is computed from, in field order."""
+        return {name: self.KIND_ARTIFACTS[field['kind']] for name, field in self.fields.items()}
+    
+    def schema(self) -> Dict[str, Any]:
+        """Output type of each field, in field order (see BaseExtractor.SCHEMA)."""
+        schema = {}
+        for name, field in self.fields.items():
+            if field['kind'] == 'pattern':
+                # Patterns with several groups match lists of unconverted strings
+                value = ['str'] if re.compile(field['pattern']).groups > 1 else field['type']
+                schema[name] = [value] if field['all'] else value
+            elif field['kind'] == 'table':
+                schema[name] = [BaseExtractor.TABLE_SCHEMA]
+            else:
+                schema[name] = 'str'
+        return schema
+    
+    def plan(self) -> Dict[str, Any]:
+        """Work out what the parser has to produce for this template.
+        
+        Returns:
+            Dict[str, Any]: 'artifacts', the page artifacts to collect ('words'
+                for pattern and section fields, 'tables' for table fields),
+                'pages' (None for all) and 'metadata' (whether it is read)
+        """
+        kinds = self.kinds()
+        return {
+            "artifacts": {artifact for kind in kinds for artifact in self.KIND_ARTIFACTS[kind]},
+            "pages": self.pages,
+            "metadata": 'metadata' in kinds
+        }
+    
+    def convert(self, field_name: str, value: Any) -> Any:
+        """Convert a matched value to the field's type, None if it does not parse."""
+        if isinstance(value, tuple):
+            return list(value)
+        convert = self.TYPES[self.fields[field_name]['type']]
+        try:
+            return convert(value.replace(',', '') if convert is not str else value)
+        except ValueError:
+            return None
+
+class TemplateExtractor(BaseExtractor):
+    """Extractor driven by an ExtractionTemplate instead of code.
+    
+    Applies the template's parse plan to the parser while extracting, so
+    text layout, table detection and metadata are only computed when a
+    field needs them.
+    """
+    
+    def __init__(self, parser: BaseParser, template: Union[ExtractionTemplate, str]):
+        """Initialize extractor with a PDF parser and a template.
+        
+        Args:
+            parser: Instance of a PDF parser
+            template: Compiled template or path to a template file
+        """
+        super().__init__(parser)
+        self.template = template if isinstance(template, ExtractionTemplate) else ExtractionTemplate.load(template)
+        self.EARLY_STOP_FIELDS = self.template.early_stop
+        self.FIELDS = self.template.field_artifacts()
+        self.SCHEMA = self.template.schema()
+    
+    @contextmanager
+    def projection(self, fields: Optional[Iterable[str]] = None) -> Iterator[List[str]]:
+        """Apply the template's parse plan and select fields for a with block.
+        
+        The parser's artifacts and pages are restored on exit. When the plan
+        narrows the pages, document-level results (text, tables, images and
+        their indexes) are discarded on entry and exit, so none computed over
+        one page selection is served for the other; page records are kept.
+        
+        Args:
+            fields: Template fields to compute; all if None
+        
+        Yields:
+            List[str]: Selected field names in output order
+        """
+        plan = self.template.plan()
+        artifacts, pages = set(self.parser.artifacts), self.parser.pages
+        planned = plan['pages']
+        if planned is not None and pages is not None:
+            planned = sorted(set(planned) & set(pages))
+        narrowed = planned is not None and planned != pages
+        
+        self.parser.artifacts = set(plan['artifacts'])
+        if narrowed:
+            self._discard_document_results()
+            self.parser.pages = planned
+        try:
+            with super().projection(fields) as selected:
+                yield selected
+        finally:
+            self.parser.artifacts = artifacts
+            if narrowed:
+                self.parser.pages = pages
+                self._discard_document_results()
+    
+    def _discard_document_results(self):
+        """Drop the memoized results assembled from the selected pages."""
+        for artifact in self.parser.ARTIFACT_DEPENDENTS['page']:
+            self.parser.cache.invalidate(artifact)
+    
+    def _fields_of_kind(self, kind: str) -> Dict[str, Dict[str, Any]]:
+        return {name: field for name, field in self.template.fields.items() if field['kind'] == kind}
+    
+    def extract(self, fields: Optional[Iterable[str]] = None, **kwargs) -> Dict[str, Any]:
+        """Extract the template's fields from the PDF.
+        
+        Args:
+            fields: Template fields to compute; all if None
+        
+        Returns:
+            Dict[str, Any]: Field values keyed by field name; None (or an empty
+                list for 'all' and table fields) if not found
+        """
+        # All pattern fields share one scan of the text, run on first use
+        patterns = {}
+        
+        def pattern_value(name: str) -> Any:
+            if not patterns:
+                patterns.update(self._pattern_values(self.parser.extract_text()))
+            return patterns[name]
+        
+        producers = {}
+        for name, field in self.template.fields.items():
+            if field['kind'] == 'pattern':
+                producers[name] = partial(pattern_value, name)
+            elif field['kind'] == 'section':
+                producers[name] = partial(self.extract_text_by_section, field['section'])
+            elif field['kind'] == 'table':
+                producers[name] = partial(self.extract_tables_by_keyword, field['table'])
+            else:
+                producers[name] = partial(self._metadata_value, field['metadata'])
+        return self.extract_fields(producers, fields)
+    
+    def _pattern_values(self, text: str) -> Dict[str, Any]:
+        """Values of the pattern fields found in text."""
+        matches = self.template.scanner.scan(text, self.timer)
+        values = {}
+        for name, field in self._fields_of_kind('pattern').items():
+            found = [self.template.convert(name, m) for m in matches[name]]
+            values[name] = found if field['all'] else (found[0] if found else None)
+        return values
+    
+    def _metadata_value(self, key: str) -> Any:
+        """Value of a document metadata entry."""
+        return self.parser.extract_metadata().get(key)
+    
+    def _begin_stream(self, **kwargs) -> Dict[str, Any]:
+        """Start a streaming extraction."""
+        return {
+            'values': {},
+            'sections': SectionStream(f['section'] for f in self._fields_of_kind('section').values()),
+            'tables': {name: [] for name in self._fields_of_kind('table')}
+        }
+    
+    def _consume_page(self, state: Dict[str, Any], page: Dict[str, Any]):
+        """Fold one streamed page into the extraction state."""
+        values = state['values']
+        if 'words' in self.parser.artifacts:
+            for name, value in self._pattern_values(page['text']).items():
+                if self.template.fields[name]['all']:
+                    values.setdefault(name, []).extend(value)
+                elif value is not None:
+                    # The first occurrence in the document wins
+                    values.setdefault(name, value)
+            state['sections'].feed(page['text'])
+        for name, field in self._fields_of_kind('table').items():
+            state['tables'][name].extend(self._filter_tables_by_keyword(page.get('tables') or [], field['table']))
+    
+    def _found_fields(self, state: Dict[str, Any]) -> Set[str]:
+        """Pattern fields found so far."""
+        return {name for name, value in state['values'].items() if value not in (None, [])}
+    
+    def _end_stream(self, state: Dict[str, Any]) -> Dict[str, Any]:
+        """Assemble results from the final streaming state."""
+        sections = state['sections'].close()
+        results = dict(state['values'])
+        for name, field in self._fields_of_kind('section').items():
+            results[name] = sections.get(field['section'])
+        results.update(state['tables'])
+        for name, field in self._fields_of_kind('metadata').items():
+            results[name] = self._metadata_value(field['metadata'])
+        return {
+            name: results.get(name, [] if field['all'] else None)
+            for name, field in self.template.fields.items()
+        }
\ No newline at end of file
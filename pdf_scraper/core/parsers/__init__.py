@@ -2,7 +2,30 @@
 PDF parser implementations.
 """
 
-from .base import BaseParser
+from typing import Dict
+from .base import BaseParser, parse_page_range
 from .pdfplumber_parser import PDFPlumberParser
+from .pymupdf_parser import PyMuPDFParser
+from .source import MemoryStream, map_file
 
-__all__ = ['BaseParser', 'PDFPlumberParser'] 
\ No newline at end of file
+# Parser engines selectable by name
+PARSER_ENGINES: Dict[str, type] = {
+    'pdfplumber': PDFPlumberParser,
+    'pymupdf': PyMuPDFParser
+}
+
+def get_parser_class(engine: str) -> type:
+    """Look up a parser class by engine name.
+    
+    Args:
+        engine: Engine name (see PARSER_ENGINES)
+        
+    Returns:
+        type: BaseParser subclass implementing the engine
+    """
+    if engine not in PARSER_ENGINES:
+        raise ValueError(f"Unknown parser engine: {engine}. Must be one of: {', '.join(PARSER_ENGINES)}")
+    return PARSER_ENGINES[engine]
+
+__all__ = ['BaseParser', 'PDFPlumberParser', 'PyMuPDFParser', 'PARSER_ENGINES', 'get_parser_class', 'parse_page_range',
+           'MemoryStream', 'map_file']
\ No newline at end of file
@@ -1,37 +1,603 @@
 from abc import ABC, abstractmethod
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Iterator, Iterable, Union, Callable, Tuple
+import hashlib
+import json
 import os
+import tempfile
+from .cache import ParseCache, DiskCache, memoized
+from .ocr import OCRConfig
+from .table_planner import TablePlanner, run_table_plan
+from .words import StringPool, WordStore
+from .source import PDFSource, as_buffer
+from .budget import TimeBudget
+from .timing import StageTimer, stage, timed
+
+def parse_page_range(spec: str) -> List[int]:
+    """Parse a page range string such as "1-3,7,10-12".
+    
+    Args:
+        spec: Comma-separated page numbers and inclusive ranges (1-based)
+        
+    Returns:
+        List[int]: Sorted, de-duplicated page numbers
+    """
+    pages = set()
+    for part in spec.split(','):
+        part = part.strip()
+        if not part:
+            continue
+        start, dash, end = part.partition('-')
+        try:
+            # An open bound ("3-" or "-3") fails to parse like any other non-number
+            first = int(start)
+            last = int(end) if dash else first
+        except ValueError:
+            raise ValueError(f"Invalid page range: {spec}")
+        if first < 1 or last < first:
+            raise ValueError(f"Invalid page range: {spec}")
+        pages.update(range(first, last + 1))
+    return sorted(pages)
+
+# Stands for "a TablePlanner of the parser's own" in BaseParser arguments
+_DEFAULT_PLANNER: Any = object()
 
 class BaseParser(ABC):
-    """Base class for PDF parsers."""
+    """Base class for PDF parsers.
+    
+    Engines implement ``_scan_page``, which visits a page once and returns
+    every requested artifact (words, tables, images) together with the page
+    dimensions. All document-level methods are derived from those per-page
+    records, which are cached so each page is laid out only once.
+    """
+    
+    # Artifacts collected for each page in a single visit
+    PAGE_ARTIFACTS = ('words', 'tables', 'images')
+    
+    # Settings for text-position based table detection
+    TABLE_SETTINGS = {
+        'vertical_strategy': 'text',  # Use text position for vertical lines
+        'horizontal_strategy': 'text',  # Use text position for horizontal lines
+        'intersection_tolerance': 3,  # Allow slight misalignments
+        'snap_tolerance': 3,  # Snap lines to nearby text
+        'join_tolerance': 3,  # Join nearby lines
+        'edge_min_length': 3,  # Minimum length for table edges
+        'min_words_vertical': 3,  # Minimum words for vertical lines
+        'min_words_horizontal': 3  # Minimum words for horizontal lines
+    }
+    
+    # Settings for ruling-line based table detection, used on ruled pages
+    LINES_TABLE_SETTINGS = {
+        'vertical_strategy': 'lines',
+        'horizontal_strategy': 'lines',
+        'intersection_tolerance': 3,
+        'snap_tolerance': 3,
+        'join_tolerance': 3,
+        'edge_min_length': 3
+    }
+    
+    # Engine name and on-disk cache format, both part of persistent cache keys
+    ENGINE = ''
+    CACHE_FORMAT = 4
+    
+    # File extensions of image streams whose single filter is a standalone image format
+    IMAGE_EXTENSIONS = {
+        'DCTDecode': 'jpg',
+        'JPXDecode': 'jp2',
+        'JBIG2Decode': 'jb2',
+        'CCITTFaxDecode': 'ccitt'
+    }
     
-    def __init__(self, file_path: str):
-        """Initialize parser with PDF file path.
+    # Cache entries that are persisted across runs; the rest is cheaply derived
+    PERSISTED_ARTIFACTS = ('page', 'metadata', 'page_count')
+    
+    # Cached artifacts computed from another, discarded along with it: page
+    # records feed every document-level artifact and the extractor indexes,
+    # text the section index, tables the table index, images the image streams
+    ARTIFACT_DEPENDENTS = {
+        'page': ('text', 'tables', 'images', 'image_streams', 'section_index', 'table_index'),
+        'text': ('section_index',),
+        'tables': ('table_index',),
+        'images': ('image_streams',)
+    }
+    
+    # Page record fields an artifact is assembled from; discarding the
+    # artifact drops them so the pages are scanned for it again
+    PAGE_RECORD_FIELDS = {'tables': ('tables', 'table_plan'), 'images': ('images',)}
+    
+    def __init__(self, source: PDFSource, ocr: Optional[OCRConfig] = None,
+                 pages: Optional[Union[str, Iterable[int]]] = None,
+                 table_planner: Optional[TablePlanner] = _DEFAULT_PLANNER,
+                 persistent_cache: Optional[DiskCache] = None,
+                 budget: Optional[TimeBudget] = None, timer: Optional[StageTimer] = None):
+        """Initialize parser with a PDF file path or in-memory PDF.
         
         Args:
-            file_path: Path to the PDF file
+            source: Path to the PDF file, or the PDF's contents as bytes,
+                bytearray, memoryview or mmap object; buffers are parsed in
+                place without being copied or written to disk
+            ocr: OCR settings for pages without a text layer; such pages
+                yield no words if None
+            pages: Pages (1-based) that document-level methods and iter_pages
+                read, as numbers or a range string like "1-3,7"; all pages if None
+            table_planner: Planner choosing a table detection strategy per page;
+                a TablePlanner with default thresholds if not given, and
+                text-position detection runs on every page if None
+            persistent_cache: On-disk cache of parse results shared across runs,
+                keyed by file content hash, engine, version and settings
+            budget: Time limits for scanning a page and the whole document; pages
+                over budget are dropped and listed in dropped_pages
+            timer: Records time spent per parsing stage (layout, table detection,
+                OCR, ...) and by extractors using this parser; disabled if None
         """
-        if not os.path.exists(file_path):
-            raise FileNotFoundError(f"PDF file not found: {file_path}")
-        self.file_path = file_path
+        self.source = source
+        self.timer = timer
+        self.buffer = as_buffer(source)
+        self.file_path = os.fspath(source) if self.buffer is None else None
+        if self.file_path is not None and not os.path.exists(self.file_path):
+            raise FileNotFoundError(f"PDF file not found: {self.file_path}")
+        self.cache = ParseCache()
+        self.artifacts = set(self.PAGE_ARTIFACTS)
+        self.ocr = ocr
+        self.pages = parse_page_range(pages) if isinstance(pages, str) else (
+            sorted(set(pages)) if pages is not None else None
+        )
+        self.table_planner = TablePlanner() if table_planner is _DEFAULT_PLANNER else table_planner
+        self._pdf = None
+        self.strings = StringPool()
+        
+        self.budget = budget
+        self.dropped_pages: List[Dict[str, Any]] = []
+        self._scan_seconds = 0.0
+        
+        self.persistent_cache = persistent_cache
+        self._persistent_key = None
+        self._persisted_misses = 0  # Misses of persisted artifacts already written
+        if persistent_cache is not None:
+            self._load_persistent()
+    
+    @property
+    def pdf(self) -> Any:
+        """Engine document handle, opened on first use.
         
+        Documents served entirely from the persistent cache are never opened.
+        A closed parser reopens the file when it needs it again.
+        """
+        if self._pdf is None:
+            self._pdf = self._open()
+        return self._pdf
+    
     @abstractmethod
-    def extract_text(self) -> str:
-        """Extract all text from the PDF.
+    def _open(self) -> Any:
+        """Open the PDF with the engine.
         
         Returns:
-            str: Extracted text content
+            Any: Engine document handle with a close() method
+        """
+        pass
+    
+    @classmethod
+    def engine_version(cls) -> str:
+        """Version of the underlying PDF library, part of persistent cache keys."""
+        return ''
+    
+    def settings_fingerprint(self) -> Dict[str, Any]:
+        """Everything besides file content that affects parse results.
+        
+        Returns:
+            Dict[str, Any]: Engine, versions and extraction settings
+        """
+        return {
+            "engine": self.ENGINE,
+            "engine_version": self.engine_version(),
+            "cache_format": self.CACHE_FORMAT,
+            "table_settings": self.TABLE_SETTINGS,
+            "lines_table_settings": self.LINES_TABLE_SETTINGS,
+            "table_planner": vars(self.table_planner) if self.table_planner is not None else None,
+            "ocr": self.ocr.recognition_settings() if self.ocr is not None else None
+        }
+    
+    def _load_persistent(self):
+        """Seed the document cache from the persistent cache, if it has this file."""
+        digest = hashlib.sha256()
+        if self.buffer is not None:
+            digest.update(self.buffer)
+        else:
+            with open(self.file_path, 'rb') as f:
+                for chunk in iter(lambda: f.read(1 << 20), b''):
+                    digest.update(chunk)
+        digest.update(json.dumps(self.settings_fingerprint(), sort_keys=True, default=str).encode('utf-8'))
+        self._persistent_key = digest.hexdigest()
+        
+        entry = self.persistent_cache.get(self._persistent_key)
+        if entry is None:
+            return
+        
+        for artifact, value in entry.items():
+            if artifact == 'page':
+                for page_number, record in value.items():
+                    if 'words' in record:
+                        record['words'] = WordStore.from_json(record['words'], self.strings, int(page_number))
+                    self.cache.put(('page', int(page_number)), record)
+            else:
+                self.cache.put((artifact,), value)
+    
+    @timed('parser.persist')
+    def persist(self):
+        """Write parse results computed since loading back to the persistent cache."""
+        misses = sum(self.cache.artifact_misses.get(a, 0) for a in self.PERSISTED_ARTIFACTS)
+        if self.persistent_cache is None or misses == self._persisted_misses:
+            return
+        
+        entry = {'page': {}}
+        for page_number in range(1, self.get_page_count() + 1):
+            record = self.cache.get(('page', page_number))
+            # Dropped pages may fit a later run's budget, so they are not persisted
+            if record is not None and 'dropped' not in record:
+                if 'words' in record:
+                    record = dict(record, words=record['words'].to_json())
+                entry['page'][str(page_number)] = record
+        for artifact in self.PERSISTED_ARTIFACTS:
+            if artifact != 'page' and (artifact,) in self.cache:
+                entry[artifact] = self.cache.get((artifact,))
+        
+        self.persistent_cache.put(self._persistent_key, entry)
+        self._persisted_misses = misses
+    
+    @property
+    def is_open(self) -> bool:
+        """Whether the engine currently holds the file open."""
+        return self._pdf is not None
+    
+    def close(self):
+        """Close the PDF file, releasing its descriptor and engine caches.
+        
+        Parse results already cached are kept.
+        """
+        if self._pdf is not None:
+            pdf, self._pdf = self._pdf, None
+            pdf.close()
+    
+    def __enter__(self) -> 'BaseParser':
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+    
+    def __del__(self):
+        """Close the PDF file when the parser is destroyed."""
+        if getattr(self, '_pdf', None) is not None:
+            self.close()
+    
+    def invalidate_cache(self, artifact: Optional[str] = None):
+        """Discard memoized parse results so they are recomputed on next access.
+        
+        Artifacts derived from the discarded one are discarded too (see
+        ARTIFACT_DEPENDENTS), and so is its per-page data (see
+        PAGE_RECORD_FIELDS): discarding 'tables' runs table detection again.
+        
+        Args:
+            artifact: Artifact to discard ('text', 'tables', 'metadata', 'images',
+                'page'); discards everything if None
+        """
+        if artifact is None:
+            self.cache.invalidate()
+            return
+        
+        discarded = [artifact]
+        for name in discarded:
+            discarded.extend(d for d in self.ARTIFACT_DEPENDENTS.get(name, ()) if d not in discarded)
+        for name in discarded:
+            self.cache.invalidate(name)
+            for field in self.PAGE_RECORD_FIELDS.get(name, ()):
+                for record in self.cache.values('page'):
+                    record.pop(field, None)
+    
+    def cache_stats(self) -> Dict[str, int]:
+        """Get hit/miss counts of the document cache.
+        
+        Returns:
+            Dict[str, int]: Cache hits, misses and stored entries
+        """
+        return self.cache.stats()
+    
+    @abstractmethod
+    def _scan_page(self, page_number: int, artifacts: Iterable[str]) -> Dict[str, Any]:
+        """Visit a page once and collect the requested artifacts.
+        
+        Implementations must release the page's layout caches before returning.
+        When collecting words they also set 'needs_ocr' if the page has no
+        text layer. Words are returned as a WordStore interned in self.strings.
+        
+        Args:
+            page_number: Page number to scan (1-based)
+            artifacts: Subset of PAGE_ARTIFACTS to collect
+        
+        Returns:
+            Dict[str, Any]: 'width' and 'height' plus one entry per requested artifact
+        """
+        pass
+    
+    @abstractmethod
+    def _render_page(self, page_number: int, dpi: int) -> bytes:
+        """Render a page to an image for OCR.
+        
+        Args:
+            page_number: Page number to render (1-based)
+            dpi: Rendering resolution
+        
+        Returns:
+            bytes: PNG-encoded page image
         """
         pass
     
     @abstractmethod
-    def extract_tables(self) -> List[Dict[str, Any]]:
+    def _image_streams(self, page_number: int, indices: Iterable[int]) -> Dict[int, Tuple[bytes, List[str]]]:
+        """Read the raw, still encoded streams of images on a page.
+        
+        Args:
+            page_number: Page number (1-based)
+            indices: Positions of the wanted images in the page record's 'images'
+        
+        Returns:
+            Dict[int, Tuple[bytes, List[str]]]: Stream bytes and filter names
+                (e.g. ['DCTDecode']) keyed by image position; images whose raw
+                stream the engine cannot read are left out
+        """
+        pass
+    
+    def _detect_tables(self, page_number: int, detect: Callable[[Dict[str, Any]], List[Any]],
+                       words: WordStore, horizontal_edges: int, vertical_edges: int,
+                       width: float, height: float, bbox: Any) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+        """Plan and run table detection for a page.
+        
+        Args:
+            page_number: Page number (1-based)
+            detect: Engine callback running detection with given settings and
+                returning raw tables (lists of rows)
+            words: Page words, used for the layout signals
+            horizontal_edges: Number of horizontal ruling lines on the page
+            vertical_edges: Number of vertical ruling lines on the page
+            width: Page width in points
+            height: Page height in points
+            bbox: Bounding box reported with each table
+        
+        Returns:
+            Tuple[List[Dict[str, Any]], Dict[str, Any]]: Cleaned tables and the plan
+                that produced them
+        """
+        if self.table_planner is None:
+            plan = {"strategy": 'text', "reason": 'planner disabled', "text_candidate": True, "signals": {}}
+        else:
+            with stage(self.timer, 'parser.table_planning'):
+                plan = self.table_planner.plan(words, horizontal_edges, vertical_edges, width, height)
+        with stage(self.timer, 'parser.table_detection'):
+            raw_tables = run_table_plan(plan, detect, self.LINES_TABLE_SETTINGS, self.TABLE_SETTINGS)
+        return self._clean_tables(page_number, raw_tables, bbox), plan
+    
+    def table_plans(self) -> List[Dict[str, Any]]:
+        """Report the table detection decision made for each scanned page.
+        
+        Returns:
+            List[Dict[str, Any]]: Per-page strategy, reason, layout signals,
+                strategies executed and detection time, ordered by page
+        """
+        plans = []
+        for page_number in range(1, self.get_page_count() + 1):
+            record = self.cache.get(('page', page_number))
+            if record is not None and 'table_plan' in record:
+                plans.append(dict(record['table_plan'], page=page_number, tables=len(record.get('tables') or [])))
+        return plans
+    
+    def _page_record(self, page_number: int, ocr: bool = True) -> Dict[str, Any]:
+        """Get the cached record of a page, scanning only artifacts not yet collected.
+        
+        Args:
+            page_number: Page number (1-based)
+            ocr: Recognize the page right away if it has no text layer
+        
+        Returns:
+            Dict[str, Any]: Page record with dimensions and collected artifacts
+        """
+        if not 1 <= page_number <= self.get_page_count():
+            raise ValueError(f"Page number {page_number} out of range")
+        
+        key = ('page', page_number)
+        record = self.cache.get(key)
+        if record is not None and self.artifacts.issubset(record):
+            self.cache.record(key, hit=True)
+        else:
+            self.cache.record(key, hit=False)
+            missing = [a for a in self.PAGE_ARTIFACTS if a in self.artifacts and (record is None or a not in record)]
+            scanned = self._scan_within_budget(page_number, missing, record)
+            if record is None:
+                record = {"page_number": page_number}
+            record.update(scanned)
+            self.cache.put(key, record)
+        
+        if ocr:
+            self._apply_ocr([record])
+        return record
+    
+    @timed('parser.scan_page')
+    def _scan_within_budget(self, page_number: int, artifacts: List[str],
+                            record: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """Scan a page, or drop it with empty artifacts if it runs over budget.
+        
+        Args:
+            page_number: Page number to scan (1-based)
+            artifacts: Subset of PAGE_ARTIFACTS to collect
+            record: Page record the scan will be merged into, if any
+        
+        Returns:
+            Dict[str, Any]: Scan result as returned by _scan_page; for dropped
+                pages, empty artifacts and 'dropped' naming the exceeded budget
+        """
+        if self.budget is None:
+            return self._scan_page(page_number, artifacts)
+        
+        scanned, exceeded, elapsed = self.budget.run(
+            lambda: self._scan_page(page_number, artifacts),
+            self._scan_seconds
+        )
+        self._scan_seconds += elapsed
+        if exceeded is None:
+            return scanned
+        
+        self.dropped_pages.append({"page": page_number, "budget": exceeded, "elapsed": elapsed})
+        dropped = {
+            "width": (record or {}).get('width', 0),
+            "height": (record or {}).get('height', 0),
+            "dropped": exceeded
+        }
+        empty = {'words': WordStore.from_tuples([], self.strings, page_number), 'tables': [], 'images': []}
+        for artifact in artifacts:
+            dropped[artifact] = empty[artifact]
+        return dropped
+    
+    def _page_numbers(self) -> List[int]:
+        """Page numbers selected for document-level reads, within the page count."""
+        page_count = self.get_page_count()
+        if self.pages is None:
+            return list(range(1, page_count + 1))
+        return [n for n in self.pages if n <= page_count]
+    
+    def _walk_pages(self) -> Iterator[Dict[str, Any]]:
+        """Visit every selected page once, yielding its cached record.
+        
+        Text-less pages are collected during the walk and recognized together
+        so OCR can run in parallel.
+        """
+        records = [
+            self._page_record(page_number, ocr=False)
+            for page_number in self._page_numbers()
+        ]
+        self._apply_ocr(records)
+        yield from records
+    
+    def _apply_ocr(self, records: List[Dict[str, Any]]):
+        """Replace the empty word lists of text-less pages with OCR results.
+        
+        Only pages flagged by the text-layer probe are rendered; the rest are
+        left untouched. Does nothing unless the parser was given OCR settings.
+        
+        Args:
+            records: Page records to update in place
+        """
+        if self.ocr is None:
+            return
+        
+        pending = [record for record in records if record.get('needs_ocr')]
+        if not pending:
+            return
+        
+        engine = self.ocr.engine()
+        # Render in batches so a long scanned document never holds every page image at once
+        for start in range(0, len(pending), self.ocr.batch_size):
+            batch = pending[start:start + self.ocr.batch_size]
+            with stage(self.timer, 'parser.ocr_render'):
+                images = {
+                    record['page_number']: self._render_page(record['page_number'], self.ocr.dpi)
+                    for record in batch
+                }
+            with stage(self.timer, 'parser.ocr'):
+                recognized = engine.recognize(images)
+            for record in batch:
+                record['words'] = WordStore.from_dicts(
+                    recognized[record['page_number']], self.strings, record['page_number']
+                )
+                record['needs_ocr'] = False
+                record['ocr'] = True
+    
+    def iter_pages(self) -> Iterator[Dict[str, Any]]:
+        """Stream page records without retaining them in the document cache.
+        
+        Each page is scanned, yielded and released before the next one is
+        visited, so memory stays bounded by the largest single page. Pages
+        already in the document cache are reused rather than rescanned.
+        
+        Yields:
+            Dict[str, Any]: Page record with 'page_number', 'text', 'words'
+                (a WordStore), 'tables', 'images', 'width' and 'height'
+        """
+        for page_number in self._page_numbers():
+            cached = self.cache.get(('page', page_number))
+            if cached is not None and self.artifacts.issubset(cached):
+                record = dict(cached)
+            else:
+                record = dict(cached or {"page_number": page_number})
+                missing = [a for a in self.PAGE_ARTIFACTS if a in self.artifacts and a not in record]
+                record.update(self._scan_within_budget(page_number, missing, record))
+            self._apply_ocr([record])
+            
+            record['text'] = '\n'.join(self._join_lines(record, 5))
+            yield record
+    
+    @staticmethod
+    def _join_lines(record: Dict[str, Any], threshold: float) -> List[str]:
+        """Group a page record's words into lines (see WordStore.line_starts)."""
+        words = record.get('words')
+        return words.lines(threshold) if words is not None else []
+    
+    @staticmethod
+    def _clean_tables(page_number: int, page_tables: List[List[List[Any]]], bbox: Any) -> List[Dict[str, Any]]:
+        """Clean raw engine tables and keep those with at least 2 rows and 2 columns."""
+        tables = []
+        for table in page_tables or []:
+            # Clean and validate table
+            cleaned_table = []
+            for row in table:
+                # Clean cell values
+                cleaned_row = [
+                    str(cell).strip() if cell is not None else ''
+                    for cell in row
+                ]
+                # Skip empty rows
+                if any(cell for cell in cleaned_row):
+                    cleaned_table.append(cleaned_row)
+            
+            # Only add tables with at least 2 rows and 2 columns
+            if len(cleaned_table) >= 2 and len(cleaned_table[0]) >= 2:
+                tables.append({
+                    "page": page_number,
+                    "table": cleaned_table,
+                    "bbox": bbox  # Add bounding box for context
+                })
+        
+        return tables
+    
+    @memoized('text')
+    @timed('parser.extract_text')
+    def extract_text(self) -> str:
+        """Extract all text from the PDF.
+        
+        Returns:
+            str: Extracted text content, one line per text row and pages
+                separated by blank lines
+        """
+        text_sections = []
+        for record in self._walk_pages():
+            # 5 points threshold for new line
+            page_text = self._join_lines(record, 5)
+            if page_text:
+                text_sections.append('\n'.join(page_text))
+        
+        # Join pages with double newlines to clearly separate sections
+        return '\n\n'.join(text_sections)
+    
+    @memoized('tables')
+    @timed('parser.extract_tables')
+    def extract_tables(self, pages: Optional[Iterable[int]] = None) -> List[Dict[str, Any]]:
         """Extract tables from the PDF.
         
+        Args:
+            pages: Page numbers (1-based) to analyze; all pages if None. Table
+                detection runs only on these pages and is cached per page.
+            
         Returns:
             List[Dict[str, Any]]: List of extracted tables with metadata
         """
-        pass
+        records = self._walk_pages() if pages is None else (self._page_record(n) for n in pages)
+        return [table for record in records for table in record.get('tables') or []]
     
     @abstractmethod
     def extract_metadata(self) -> Dict[str, Any]:
@@ -42,14 +608,97 @@ class BaseParser(ABC):
         """
         pass
     
-    @abstractmethod
+    @memoized('images')
+    @timed('parser.extract_images')
     def extract_images(self) -> List[Dict[str, Any]]:
         """Extract images from the PDF.
         
         Returns:
             List[Dict[str, Any]]: List of extracted images with metadata
         """
-        pass
+        return [image for record in self._walk_pages() for image in record.get('images') or []]
+    
+    @memoized('image_streams')
+    @timed('parser.extract_image_streams')
+    def extract_image_streams(self, output_dir: Optional[str] = None) -> Dict[str, Any]:
+        """Extract the encoded image streams of the PDF without decoding them.
+        
+        Each distinct image is read once: occurrences sharing a PDF object
+        reference (a logo on every page) reuse the first read, and streams
+        with identical bytes share one content hash as their id.
+        
+        Args:
+            output_dir: Directory to write streams to, as <id[:2]>/<id>.<ext>;
+                existing files are not rewritten. Stream bytes are returned
+                in memory instead if None
+        
+        Returns:
+            Dict[str, Any]: 'images', the image metadata of extract_images with
+                an 'image_id' per occurrence (None if the engine could not read
+                the stream), and 'streams', keyed by image_id,
+                with 'filters', 'ext', 'size' and either 'path' or 'data'
+        """
+        occurrences = []
+        streams = {}
+        ids_by_ref = {}
+        
+        for record in self._walk_pages():
+            images = record.get('images') or []
+            # Read each object once, even if it occurs several times on this page
+            unread = []
+            seen = set()
+            for index, image in enumerate(images):
+                ref = image.get('ref')
+                if ref is None or (ref not in ids_by_ref and ref not in seen):
+                    unread.append(index)
+                    seen.add(ref)
+            raw = self._image_streams(record['page_number'], unread) if unread else {}
+            
+            for index, image in enumerate(images):
+                ref = image.get('ref')
+                if index in raw:
+                    data, filters = raw[index]
+                    image_id = hashlib.sha256(data).hexdigest()
+                    if image_id not in streams:
+                        streams[image_id] = self._store_image_stream(image_id, data, filters, output_dir)
+                    if ref is not None:
+                        ids_by_ref[ref] = image_id
+                else:
+                    image_id = ids_by_ref.get(ref)
+                occurrences.append(dict(image, image_id=image_id))
+        
+        return {"images": occurrences, "streams": streams}
+    
+    def _store_image_stream(self, image_id: str, data: bytes, filters: List[str],
+                            output_dir: Optional[str]) -> Dict[str, Any]:
+        """Describe an image stream, writing it to output_dir if given."""
+        ext = self.IMAGE_EXTENSIONS.get(filters[0], 'bin') if len(filters) == 1 else 'bin'
+        stream = {"filters": filters, "ext": ext, "size": len(data)}
+        if output_dir is None:
+            stream['data'] = data
+            return stream
+        
+        path = os.path.join(output_dir, image_id[:2], f"{image_id}.{ext}")
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        stream['path'] = path
+        return stream
+    
+    def extract_words(self, page_number: int) -> List[Dict[str, Any]]:
+        """Extract positioned words from a specific page.
+        
+        Args:
+            page_number: Page number to extract (1-based)
+        
+        Returns:
+            List[Dict[str, Any]]: Words with text and x0/top/x1/bottom coordinates
+        """
+        words = self._page_record(page_number).get('words')
+        return words.to_dicts() if words is not None else []
     
     @abstractmethod
     def get_page_count(self) -> int:
@@ -60,14 +709,25 @@ class BaseParser(ABC):
         """
         pass
     
-    @abstractmethod
     def extract_page(self, page_number: int) -> Dict[str, Any]:
         """Extract content from a specific page.
         
         Args:
             page_number: Page number to extract (1-based)
-            
+        
         Returns:
             Dict[str, Any]: Page content including text, tables, and images
         """
-        pass 
\ No newline at end of file
+        record = self._page_record(page_number)
+        
+        # Group text into sections based on spacing (10 points threshold)
+        sections = self._join_lines(record, 10)
+        
+        return {
+            "text": '\n\n'.join(sections),
+            "tables": record.get('tables') or [],
+            "images": record.get('images') or [],
+            "width": record['width'],
+            "height": record['height'],
+            "page_number": page_number
+        }
@@ -0,0 +1,82 @@
+from typing import Any, Callable, Optional, Tuple
+import signal
+import threading
+import time
+
+class BudgetExceeded(BaseException):
+    """Raised inside a page scan when its time budget runs out.
+    
+    Derives from BaseException so engine code catching Exception cannot
+    swallow it.
+    """
+
+class TimeBudget:
+    """Time limits for scanning a single page and a whole document.
+    
+    In the main thread of a POSIX process, scans are interrupted with a
+    SIGALRM timer as soon as the budget runs out. Elsewhere the budget is
+    checked once the scan returns, so an overrunning page is still dropped
+    but the time it took cannot be cut short. Native code (such as MuPDF)
+    is only interrupted once it hands control back to Python.
+    """
+    
+    def __init__(self, page_seconds: Optional[float] = None, document_seconds: Optional[float] = None):
+        """Initialize budgets.
+        
+        Args:
+            page_seconds: Time allowed for scanning one page; unlimited if None
+            document_seconds: Time allowed for scanning all pages of a document;
+                unlimited if None
+        """
+        self.page_seconds = page_seconds
+        self.document_seconds = document_seconds
+    
+    @staticmethod
+    def _can_interrupt() -> bool:
+        return hasattr(signal, 'setitimer') and threading.current_thread() is threading.main_thread()
+    
+    @staticmethod
+    def _raise_exceeded(signum, frame):
+        raise BudgetExceeded()
+    
+    def run(self, scan: Callable[[], Any], spent: float) -> Tuple[Any, Optional[str], float]:
+        """Run a page scan within the page budget and what is left of the document's.
+        
+        Args:
+            scan: Zero-argument callable scanning the page
+            spent: Seconds the document has already spent scanning
+        
+        Returns:
+            Tuple[Any, Optional[str], float]: Scan result (None if dropped), the
+                budget that was exceeded ('page' or 'document', None if within
+                budget) and the seconds spent
+        """
+        limit, reason = self.page_seconds, 'page'
+        if self.document_seconds is not None:
+            remaining = self.document_seconds - spent
+            if remaining <= 0:
+                return None, 'document', 0.0
+            if limit is None or remaining < limit:
+                limit, reason = remaining, 'document'
+        if limit is None:
+            start = time.perf_counter()
+            return scan(), None, time.perf_counter() - start
+        
+        start = time.perf_counter()
+        if not self._can_interrupt():
+            result = scan()
+            elapsed = time.perf_counter() - start
+            return (None, reason, elapsed) if elapsed > limit else (result, None, elapsed)
+        
+        previous = signal.signal(signal.SIGALRM, self._raise_exceeded)
+        try:
+            signal.setitimer(signal.ITIMER_REAL, limit)
+            try:
+                result = scan()
+            finally:
+                signal.setitimer(signal.ITIMER_REAL, 0)
+        except BudgetExceeded:
+            return None, reason, time.perf_counter() - start
+        finally:
+            signal.signal(signal.SIGALRM, previous)
+        return result, None, time.perf_counter() - start
\ No newline at end of file
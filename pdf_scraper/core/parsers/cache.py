@@ -0,0 +1,241 @@
+from typing import Dict, List, Any, Callable, Hashable, Iterator, Optional, Tuple
+import functools
+import inspect
+import json
+import os
+import tempfile
+
+class ParseCache:
+    """In-memory store of parse results for a single document.
+    
+    Entries are keyed by tuples whose first element names the artifact
+    (``'text'``, ``'tables'``, ``'words'``...), so a whole artifact family can
+    be invalidated at once. Cached values are shared between all callers and
+    must be treated as read-only.
+    """
+    
+    def __init__(self):
+        self._entries: Dict[Tuple[Hashable, ...], Any] = {}
+        self.hits = 0
+        self.misses = 0
+        self.artifact_misses: Dict[Hashable, int] = {}
+    
+    def __contains__(self, key: Tuple[Hashable, ...]) -> bool:
+        return key in self._entries
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def get(self, key: Tuple[Hashable, ...], default: Any = None) -> Any:
+        """Return a cached value without touching the hit/miss counters."""
+        return self._entries.get(key, default)
+    
+    def put(self, key: Tuple[Hashable, ...], value: Any):
+        """Store a value computed outside of ``get_or_compute``."""
+        self._entries[key] = value
+    
+    def record(self, key: Tuple[Hashable, ...], hit: bool):
+        """Count a lookup served (hit) or computed (miss) outside of get_or_compute."""
+        if hit:
+            self.hits += 1
+        else:
+            self.misses += 1
+            self.artifact_misses[key[0]] = self.artifact_misses.get(key[0], 0) + 1
+    
+    def get_or_compute(self, key: Tuple[Hashable, ...], compute: Callable[[], Any]) -> Any:
+        """Return the cached value for key, computing and storing it on a miss.
+        
+        Args:
+            key: Cache key, starting with the artifact name
+            compute: Zero-argument callable producing the value
+        
+        Returns:
+            Any: Cached or freshly computed value
+        """
+        if key in self._entries:
+            self.record(key, hit=True)
+            return self._entries[key]
+        
+        self.record(key, hit=False)
+        value = compute()
+        self._entries[key] = value
+        return value
+    
+    def invalidate(self, artifact: Optional[str] = None):
+        """Drop cached entries.
+        
+        Args:
+            artifact: Artifact name to drop (e.g. ``'tables'``); drops everything if None
+        """
+        if artifact is None:
+            self._entries.clear()
+            return
+        for key in [k for k in self._entries if k[0] == artifact]:
+            del self._entries[key]
+    
+    def stats(self) -> Dict[str, int]:
+        """Report cache effectiveness.
+        
+        Returns:
+            Dict[str, int]: Hit and miss counts and the number of stored entries
+        """
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "entries": len(self._entries)
+        }
+    
+    def values(self, artifact: str) -> List[Any]:
+        """Cached values of one artifact family, e.g. every ``'page'`` record."""
+        return [value for key, value in self._entries.items() if key[0] == artifact]
+
+def _freeze(value: Any) -> Hashable:
+    """Turn call arguments into a hashable cache key component."""
+    if isinstance(value, (list, tuple, range, set, frozenset)):
+        items = sorted(value) if isinstance(value, (set, frozenset)) else value
+        return tuple(_freeze(v) for v in items)
+    if isinstance(value, dict):
+        return tuple((k, _freeze(v)) for k, v in sorted(value.items()))
+    return value
+
+def memoized(artifact: str) -> Callable:
+    """Cache a parser method's result in the parser's ``ParseCache``.
+    
+    The cache key is the artifact name followed by the call arguments,
+    bound to the method's parameters with defaults filled in, so
+    ``extract_tables(pages=[1])`` and ``extract_tables(pages=[2])`` are cached
+    separately while ``extract_tables()`` and ``extract_tables(pages=None)``
+    share an entry. Methods without parameters are keyed by ``(artifact,)``.
+    
+    Args:
+        artifact: Artifact name used as the first element of the cache key
+    """
+    def decorator(method: Callable) -> Callable:
+        signature = inspect.signature(method)
+        
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            bound = signature.bind(self, *args, **kwargs)
+            bound.apply_defaults()
+            # Materialize one-shot iterators so they can be both keyed and consumed
+            for name, value in bound.arguments.items():
+                if isinstance(value, Iterator):
+                    bound.arguments[name] = tuple(value)
+            values = list(bound.arguments.values())[1:]
+            key = (artifact,) + tuple(_freeze(value) for value in values)
+            return self.cache.get_or_compute(key, lambda: method(*bound.args, **bound.kwargs))
+        return wrapper
+    return decorator
+
+class DiskCache:
+    """Size-bounded on-disk store of JSON values with least-recently-used eviction.
+    
+    Values live in one file per key, sharded by the first two characters of
+    the key, which is expected to be a hex digest. Reads refresh a file's
+    modification time, so eviction removes the entries used longest ago.
+    Writes are atomic, so concurrent processes may share a directory.
+    """
+    
+    def __init__(self, directory: str, max_bytes: int = 1 << 30):
+        """Initialize the cache.
+        
+        Args:
+            directory: Directory holding the cache files (created if missing)
+            max_bytes: Total size above which least recently used entries are evicted
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._size: Optional[int] = None
+        os.makedirs(directory, exist_ok=True)
+    
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], f"{key}.json")
+    
+    def get(self, key: str) -> Optional[Any]:
+        """Load a cached value.
+        
+        Args:
+            key: Hex digest identifying the value
+            
+        Returns:
+            Optional[Any]: Cached value, or None on a miss
+        """
+        path = self._path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                value = json.load(f)
+            os.utime(path)  # Mark as recently used
+        except (OSError, ValueError):
+            # Missing, concurrently evicted or partially written entries are misses
+            self.misses += 1
+            return None
+        
+        self.hits += 1
+        return value
+    
+    def put(self, key: str, value: Any):
+        """Store a value, evicting old entries if the cache grows past max_bytes.
+        
+        Args:
+            key: Hex digest identifying the value
+            value: JSON-serializable value
+        """
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(value, f, ensure_ascii=False, default=str)
+        size = os.path.getsize(tmp_path)
+        os.replace(tmp_path, path)
+        
+        if self._size is None:
+            self._size = self._disk_usage()
+        else:
+            self._size += size
+        if self._size > self.max_bytes:
+            self._evict()
+    
+    def _entries(self):
+        for shard in os.scandir(self.directory):
+            if shard.is_dir():
+                for entry in os.scandir(shard.path):
+                    if entry.name.endswith('.json'):
+                        yield entry
+    
+    def _disk_usage(self) -> int:
+        return sum(entry.stat().st_size for entry in self._entries())
+    
+    def _evict(self):
+        """Delete least recently used entries until the cache fits in max_bytes."""
+        entries = []
+        for entry in self._entries():
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+        entries.sort()
+        
+        self._size = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if self._size <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            self._size -= size
+    
+    def stats(self) -> Dict[str, int]:
+        """Report cache effectiveness.
+        
+        Returns:
+            Dict[str, int]: Hit and miss counts of this cache instance
+        """
+        return {
+            "hits": self.hits,
+            "misses": self.misses
+        }
\ No newline at end of file
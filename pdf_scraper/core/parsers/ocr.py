@@ -0,0 +1,184 @@
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Any, Optional
+import hashlib
+import itertools
+import json
+import numpy as np
+from .cache import DiskCache
+
+class OCRConfig:
+    """Settings for the OCR fallback used on pages without a text layer."""
+    
+    def __init__(self, dpi: int = 300, workers: Optional[int] = None, lang: str = 'eng',
+                 preprocess: bool = True, tesseract_config: str = '', batch_size: int = 16,
+                 cache_dir: Optional[str] = None, cache_max_bytes: int = 1 << 30):
+        """Initialize OCR settings.
+        
+        Args:
+            dpi: Resolution pages are rendered at before recognition
+            workers: Size of the OCR process pool; one per CPU if None, serial if 1
+            batch_size: Maximum number of rendered pages held in memory at once
+            cache_dir: Directory of the OCR result cache; results are not cached if None
+            cache_max_bytes: Size of the OCR result cache before old entries are evicted
+            lang: Tesseract language code(s), e.g. 'eng' or 'eng+deu'
+            preprocess: Binarize rendered pages with Otsu thresholding before OCR
+            tesseract_config: Extra command line options passed to tesseract
+        """
+        self.dpi = dpi
+        self.workers = workers
+        self.lang = lang
+        self.preprocess = preprocess
+        self.tesseract_config = tesseract_config
+        self.batch_size = batch_size
+        self.cache_dir = cache_dir
+        self.cache_max_bytes = cache_max_bytes
+        self._engine: Optional['OCREngine'] = None
+    
+    def engine(self) -> 'OCREngine':
+        """OCR engine for these settings, built on first use.
+        
+        Every parser given this config shares the engine, so its result cache
+        is opened, and sized, once rather than on every page recognized.
+        """
+        if self._engine is None:
+            self._engine = OCREngine(self)
+        return self._engine
+    
+    def close(self):
+        """Shut down the engine's OCR worker processes, if any were started."""
+        if self._engine is not None:
+            self._engine.close()
+    
+    def __getstate__(self) -> Dict[str, Any]:
+        # Worker processes build their own engine
+        state = dict(self.__dict__)
+        state['_engine'] = None
+        return state
+    
+    def recognition_settings(self) -> Dict[str, Any]:
+        """Settings that affect recognized output, as used in OCR cache keys."""
+        return {
+            "dpi": self.dpi,
+            "lang": self.lang,
+            "preprocess": self.preprocess,
+            "tesseract_config": self.tesseract_config
+        }
+
+def ocr_image(image: bytes, dpi: int, lang: str, preprocess: bool, tesseract_config: str = '') -> List[Dict[str, Any]]:
+    """Recognize words in a rendered page image.
+    
+    Runs in OCR worker processes, so it only takes picklable arguments.
+    
+    Args:
+        image: Encoded (PNG) page image
+        dpi: Resolution the page was rendered at, used to convert pixels to points
+        lang: Tesseract language code(s)
+        preprocess: Binarize the image before recognition
+        tesseract_config: Extra command line options passed to tesseract
+    
+    Returns:
+        List[Dict[str, Any]]: Words in reading order with text and x0/top/x1/bottom
+            coordinates in PDF points, matching BaseParser.extract_words
+    """
+    # Imported on first use, so parsers load without OpenCV and tesseract
+    # unless a page actually needs OCR
+    import cv2
+    import pytesseract
+    
+    pixels = cv2.imdecode(np.frombuffer(image, dtype=np.uint8), cv2.IMREAD_GRAYSCALE)
+    if preprocess:
+        _, pixels = cv2.threshold(pixels, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+    
+    data = pytesseract.image_to_data(pixels, lang=lang, config=tesseract_config, output_type=pytesseract.Output.DICT)
+    scale = 72.0 / dpi
+    
+    words = []
+    for text, conf, left, top, width, height in zip(
+        data['text'], data['conf'], data['left'], data['top'], data['width'], data['height']
+    ):
+        # Structural rows (blocks, lines) carry conf -1 and no text
+        if not text.strip() or float(conf) < 0:
+            continue
+        words.append({
+            "text": text.strip(),
+            "x0": left * scale,
+            "top": top * scale,
+            "x1": (left + width) * scale,
+            "bottom": (top + height) * scale
+        })
+    return words
+
+class OCREngine:
+    """Recognizes rendered pages, fanning out over a process pool.
+    
+    With a cache directory configured, results are stored under a hash of the
+    rendered image and the recognition settings, so a page seen before in any
+    file or run (cover sheets, form templates) is recognized only once.
+    """
+    
+    def __init__(self, config: OCRConfig):
+        self.config = config
+        self.cache = DiskCache(config.cache_dir, config.cache_max_bytes) if config.cache_dir else None
+        self._settings_key = json.dumps(config.recognition_settings(), sort_keys=True).encode('utf-8')
+        # Started on the first batch needing it and kept for later batches and documents
+        self._pool: Optional[ProcessPoolExecutor] = None
+    
+    def cache_key(self, image: bytes) -> str:
+        """Content address of an image's OCR result under the current settings."""
+        digest = hashlib.sha256(image)
+        digest.update(self._settings_key)
+        return digest.hexdigest()
+    
+    def recognize(self, images: Dict[int, bytes]) -> Dict[int, List[Dict[str, Any]]]:
+        """Recognize words in rendered page images.
+        
+        Args:
+            images: Encoded page images keyed by page number
+        
+        Returns:
+            Dict[int, List[Dict[str, Any]]]: Recognized words keyed by page number
+        """
+        if not images:
+            return {}
+        
+        # Identical pages within the batch share one key and are recognized once
+        keys = {page_number: self.cache_key(image) for page_number, image in images.items()}
+        results: Dict[str, List[Dict[str, Any]]] = {}
+        pending: Dict[str, bytes] = {}
+        for page_number, key in keys.items():
+            if key in results or key in pending:
+                continue
+            cached = self.cache.get(key) if self.cache else None
+            if cached is not None:
+                results[key] = cached
+            else:
+                pending[key] = images[page_number]
+        
+        pending_keys = list(pending)
+        args = (
+            [pending[key] for key in pending_keys],
+            itertools.repeat(self.config.dpi),
+            itertools.repeat(self.config.lang),
+            itertools.repeat(self.config.preprocess),
+            itertools.repeat(self.config.tesseract_config)
+        )
+        
+        if self.config.workers == 1 or len(pending_keys) <= 1:
+            recognized = list(map(ocr_image, *args))
+        else:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(max_workers=self.config.workers)
+            recognized = list(self._pool.map(ocr_image, *args))
+        
+        for key, words in zip(pending_keys, recognized):
+            results[key] = words
+            if self.cache:
+                self.cache.put(key, words)
+        
+        return {page_number: results[key] for page_number, key in keys.items()}
+    
+    def close(self):
+        """Shut down the OCR process pool; a later batch starts a new one."""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
\ No newline at end of file
@@ -0,0 +1,153 @@
+import fitz
+from typing import Dict, List, Any, Iterable, Tuple
+from .base import BaseParser
+from .cache import memoized
+from .words import WordStore
+from .timing import stage, timed
+
+class PyMuPDFParser(BaseParser):
+    """PDF parser implementation using PyMuPDF (fitz).
+    
+    Text extraction runs on MuPDF's native text engine, which is much faster
+    than pdfminer's layout analysis for text-only templates.
+    """
+    
+    ENGINE = 'pymupdf'
+    
+    def _open(self):
+        """Open the file or buffer with PyMuPDF.
+        
+        PyMuPDF only reads in-memory documents from bytes, so other buffer
+        types are copied once here.
+        """
+        if self.buffer is not None:
+            data = self.source if isinstance(self.source, bytes) else self.buffer.tobytes()
+            return fitz.open(stream=data, filetype="pdf")
+        return fitz.open(self.file_path)
+    
+    @classmethod
+    def engine_version(cls) -> str:
+        """Installed PyMuPDF version."""
+        return fitz.VersionBind
+    
+    def _scan_page(self, page_number: int, artifacts: Iterable[str]) -> Dict[str, Any]:
+        """Collect words, tables and images from a page in one visit."""
+        page = self.pdf.load_page(page_number - 1)
+        record = {
+            "width": page.rect.width,
+            "height": page.rect.height
+        }
+        
+        if 'words' in artifacts:
+            with stage(self.timer, 'parser.words'):
+                # Words come back as (x0, y0, x1, y1, text, block, line, word) tuples,
+                # which map straight onto the word store columns; sort=True orders
+                # them top-to-bottom, left-to-right
+                record['words'] = WordStore.from_tuples(page.get_text("words", sort=True), self.strings, page_number)
+            record['needs_ocr'] = not len(record['words'])
+        
+        if 'tables' in artifacts:
+            words = record.get('words')
+            if words is None:
+                # Same words a text scan would produce, so the table plan does
+                # not depend on which artifacts were requested
+                with stage(self.timer, 'parser.words'):
+                    words = WordStore.from_tuples(page.get_text("words", sort=True), self.strings, page_number)
+            with stage(self.timer, 'parser.ruling_lines'):
+                horizontal_edges, vertical_edges = self._count_ruling_lines(page)
+            record['tables'], record['table_plan'] = self._detect_tables(
+                page_number,
+                lambda settings: [table.extract() for table in page.find_tables(**settings).tables],
+                words,
+                horizontal_edges,
+                vertical_edges,
+                page.rect.width,
+                page.rect.height,
+                tuple(page.rect)
+            )
+        
+        if 'images' in artifacts:
+            with stage(self.timer, 'parser.images'):
+                # get_images() carries the resource names pdfplumber reports as "type"
+                names = {img[0]: img[7] for img in page.get_images(full=True)}
+                images = []
+                for img in page.get_image_info(xrefs=True):
+                    x0, top, x1, bottom = img["bbox"]
+                    images.append({
+                        "page": page_number,
+                        "x0": x0,
+                        # Report y coordinates from the page bottom, as pdfplumber does
+                        "y0": page.rect.height - bottom,
+                        "x1": x1,
+                        "y1": page.rect.height - top,
+                        "width": x1 - x0,
+                        "height": bottom - top,
+                        "type": names.get(img.get("xref")),
+                        # Inline images report xref 0
+                        "ref": img.get("xref") or None
+                    })
+                record['images'] = images
+        
+        return record
+    
+    @staticmethod
+    def _count_ruling_lines(page) -> Tuple[int, int]:
+        """Count horizontal and vertical ruling lines among the page's vector drawings."""
+        horizontal = vertical = 0
+        for path in page.get_drawings():
+            for item in path["items"]:
+                if item[0] == "l":
+                    p1, p2 = item[1], item[2]
+                    if abs(p1.y - p2.y) < 1:
+                        horizontal += 1
+                    elif abs(p1.x - p2.x) < 1:
+                        vertical += 1
+                elif item[0] == "re":
+                    # Rectangles contribute their four sides
+                    horizontal += 2
+                    vertical += 2
+        return horizontal, vertical
+    
+    def _image_streams(self, page_number: int, indices: Iterable[int]) -> Dict[int, Tuple[bytes, List[str]]]:
+        """Read raw image streams by xref without applying their filters.
+        
+        MuPDF exposes inline images only decoded, so they are left out.
+        """
+        infos = self.pdf.load_page(page_number - 1).get_image_info(xrefs=True)
+        streams = {}
+        for index in indices:
+            xref = infos[index].get("xref")
+            if not xref:
+                continue
+            kind, value = self.pdf.xref_get_key(xref, "Filter")
+            # Filter is absent, a single /Name or an array of names
+            filters = value.strip('[]').replace('/', ' ').split() if kind in ('name', 'array') else []
+            streams[index] = (self.pdf.xref_stream_raw(xref), filters)
+        return streams
+    
+    def _render_page(self, page_number: int, dpi: int) -> bytes:
+        """Render a page to PNG with MuPDF."""
+        return self.pdf.load_page(page_number - 1).get_pixmap(dpi=dpi).tobytes("png")
+    
+    @memoized('metadata')
+    @timed('parser.extract_metadata')
+    def extract_metadata(self) -> Dict[str, Any]:
+        """Extract PDF metadata using PyMuPDF; entries the PDF leaves empty are omitted."""
+        metadata = {}
+        if self.pdf.metadata:
+            metadata = {
+                "title": self.pdf.metadata.get("title"),
+                "author": self.pdf.metadata.get("author"),
+                "subject": self.pdf.metadata.get("subject"),
+                "keywords": self.pdf.metadata.get("keywords"),
+                "creator": self.pdf.metadata.get("creator"),
+                "producer": self.pdf.metadata.get("producer"),
+                "creation_date": self.pdf.metadata.get("creationDate"),
+                "modification_date": self.pdf.metadata.get("modDate")
+            }
+        return {key: value for key, value in metadata.items() if value}
+    
+    @memoized('page_count')
+    def get_page_count(self) -> int:
+        """Get total number of pages in the PDF."""
+        return self.pdf.page_count
\ No newline at end of file
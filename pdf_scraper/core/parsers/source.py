@@ -0,0 +1,84 @@
+from typing import Any, Optional, Union
+import io
+import mmap
+import os
+
+# What parsers accept as a document: a path, or the document's bytes in memory
+PDFSource = Union[str, os.PathLike, bytes, bytearray, memoryview, mmap.mmap]
+
+def as_buffer(source: Any) -> Optional[memoryview]:
+    """View an in-memory PDF source without copying it.
+    
+    Args:
+        source: bytes, bytearray, memoryview or mmap object, or a path
+    
+    Returns:
+        Optional[memoryview]: Flat byte view of the buffer, or None for paths
+    """
+    if isinstance(source, (str, os.PathLike)):
+        return None
+    view = memoryview(source)
+    return view if view.format == 'B' and view.ndim == 1 else view.cast('B')
+
+def map_file(file_path: Union[str, os.PathLike]) -> mmap.mmap:
+    """Memory-map a local PDF read-only, so pages are loaded by the OS on demand.
+    
+    Args:
+        file_path: Path to the PDF file
+    
+    Returns:
+        mmap.mmap: Read-only mapping of the whole file, usable as a parser source
+    """
+    with open(file_path, 'rb') as f:
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+class MemoryStream(io.RawIOBase):
+    """Seekable read-only file object over a memoryview.
+    
+    Lets engines that read through file objects parse a buffer in place:
+    readinto copies straight from the buffer into the caller's, and the
+    buffer itself is never duplicated.
+    """
+    
+    def __init__(self, view: memoryview):
+        self._view = view
+        self._position = 0
+    
+    def readable(self) -> bool:
+        return True
+    
+    def seekable(self) -> bool:
+        return True
+    
+    def tell(self) -> int:
+        return self._position
+    
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_CUR:
+            offset += self._position
+        elif whence == io.SEEK_END:
+            offset += len(self._view)
+        if offset < 0:
+            raise ValueError(f"Negative seek position {offset}")
+        self._position = offset
+        return offset
+    
+    def readinto(self, buffer: Any) -> int:
+        target = memoryview(buffer).cast('B')
+        chunk = self._view[self._position:self._position + len(target)]
+        target[:len(chunk)] = chunk
+        self._position += len(chunk)
+        return len(chunk)
+    
+    def read(self, size: int = -1) -> bytes:
+        end = len(self._view) if size is None or size < 0 else min(self._position + size, len(self._view))
+        chunk = self._view[self._position:end].tobytes() if end > self._position else b''
+        self._position += len(chunk)
+        return chunk
+    
+    def readall(self) -> bytes:
+        return self.read()
+    
+    def getbuffer(self) -> memoryview:
+        """The underlying buffer, as io.BytesIO provides it."""
+        return self._view
\ No newline at end of file
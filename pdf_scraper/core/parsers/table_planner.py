@@ -0,0 +1,156 @@
+from typing import Dict, List, Any, Callable
+import time
+import numpy as np
+from .words import WordStore
+
+class TablePlanner:
+    """Chooses a table detection strategy for a page from cheap layout signals.
+    
+    Text-position detection is the most expensive part of a page scan and
+    finds nothing on prose pages. The planner looks at ruling lines, word
+    column alignment, wide gaps between words on a line and word count, then:
+    
+    - skips detection when the page has no table candidates,
+    - uses the cheaper 'lines' strategy when ruled tables are present,
+    - falls back to 'text' when text is laid out in columns, or when
+      ruled detection comes back empty on a page that also looks tabular.
+    """
+    
+    def __init__(self, min_words: int = 6, min_ruling_edges: int = 2, min_rows: int = 3,
+                 min_columns: int = 2, column_tolerance: float = 3, gap_width: float = 12,
+                 line_tolerance: float = 3):
+        """Initialize planner thresholds.
+        
+        Args:
+            min_words: Pages with fewer words are not searched for text tables
+            min_ruling_edges: Horizontal and vertical ruling lines needed for the 'lines' strategy
+            min_rows: Rows a column edge must line up across to count as a column
+            min_columns: Aligned columns needed for a text table candidate
+            column_tolerance: Bucket width (points) when aligning word edges
+            gap_width: Horizontal gap (points) between words that suggests a cell boundary
+            line_tolerance: Vertical distance (points) within which words share a row
+        """
+        self.min_words = min_words
+        self.min_ruling_edges = min_ruling_edges
+        self.min_rows = min_rows
+        self.min_columns = min_columns
+        self.column_tolerance = column_tolerance
+        self.gap_width = gap_width
+        self.line_tolerance = line_tolerance
+    
+    def signals(self, words: WordStore, horizontal_edges: int, vertical_edges: int,
+                width: float, height: float) -> Dict[str, Any]:
+        """Measure the layout signals the plan is based on.
+        
+        Args:
+            words: Page words
+            horizontal_edges: Number of horizontal ruling lines on the page
+            vertical_edges: Number of vertical ruling lines on the page
+            width: Page width in points
+            height: Page height in points
+        
+        Returns:
+            Dict[str, Any]: Word count and density, ruling line counts, aligned
+                columns and rows containing cell-sized gaps
+        """
+        rows = words.rows(self.line_tolerance)
+        
+        # Rows with at least one wide gap between consecutive words
+        order = np.lexsort((words.x0, rows))
+        sorted_rows = rows[order]
+        gaps = words.x0[order][1:] - words.x1[order][:-1]
+        wide = (sorted_rows[1:] == sorted_rows[:-1]) & (gaps > self.gap_width)
+        gapped_rows = len(np.unique(sorted_rows[1:][wide]))
+        
+        # Left or right word edges lining up across several rows
+        aligned_columns = 0
+        for edge in (words.x0, words.x1):
+            buckets = np.round(edge / self.column_tolerance).astype(np.int64)
+            pairs = np.unique(np.stack((buckets, rows)), axis=1)
+            _, rows_per_bucket = np.unique(pairs[0], return_counts=True)
+            aligned_columns += int(np.count_nonzero(rows_per_bucket >= self.min_rows))
+        
+        area = (width * height) or 1
+        return {
+            "words": len(words),
+            "word_density": len(words) / area * 10000,  # words per 100x100 points
+            "horizontal_edges": horizontal_edges,
+            "vertical_edges": vertical_edges,
+            "aligned_columns": aligned_columns,
+            "gapped_rows": gapped_rows
+        }
+    
+    def plan(self, words: WordStore, horizontal_edges: int, vertical_edges: int,
+             width: float, height: float) -> Dict[str, Any]:
+        """Decide how to detect tables on a page.
+        
+        Args:
+            words: Page words
+            horizontal_edges: Number of horizontal ruling lines on the page
+            vertical_edges: Number of vertical ruling lines on the page
+            width: Page width in points
+            height: Page height in points
+        
+        Returns:
+            Dict[str, Any]: 'strategy' ('skip', 'lines' or 'text'), 'reason',
+                'text_candidate' and the measured 'signals'
+        """
+        signals = self.signals(words, horizontal_edges, vertical_edges, width, height)
+        
+        text_candidate = (
+            signals['words'] >= self.min_words and
+            signals['gapped_rows'] >= self.min_rows and
+            # The left margin always lines up, so require columns beyond it
+            signals['aligned_columns'] > self.min_columns
+        )
+        ruled = horizontal_edges >= self.min_ruling_edges and vertical_edges >= self.min_ruling_edges
+        
+        if ruled:
+            strategy, reason = 'lines', 'ruling lines present'
+        elif text_candidate:
+            strategy, reason = 'text', 'words aligned in columns'
+        elif signals['words'] < self.min_words:
+            strategy, reason = 'skip', 'too few words'
+        else:
+            strategy, reason = 'skip', 'no table candidates'
+        
+        return {
+            "strategy": strategy,
+            "reason": reason,
+            "text_candidate": text_candidate,
+            "signals": signals
+        }
+
+def run_table_plan(plan: Dict[str, Any], detect: Callable[[Dict[str, Any]], List[Any]],
+                   lines_settings: Dict[str, Any], text_settings: Dict[str, Any]) -> List[Any]:
+    """Run table detection as planned, falling back from 'lines' to 'text' if needed.
+    
+    Records the strategies actually run and the time spent in plan['executed']
+    and plan['elapsed'].
+    
+    Args:
+        plan: Plan from TablePlanner.plan (updated in place)
+        detect: Engine callback running detection with the given settings
+        lines_settings: Settings for ruling-line based detection
+        text_settings: Settings for text-position based detection
+    
+    Returns:
+        List[Any]: Raw tables found by the engine
+    """
+    start = time.perf_counter()
+    executed = []
+    tables = []
+    
+    if plan['strategy'] == 'lines':
+        executed.append('lines')
+        tables = detect(lines_settings)
+        if not tables and plan['text_candidate']:
+            plan['strategy'], plan['reason'] = 'text', 'no ruled tables found, text laid out in columns'
+    
+    if plan['strategy'] == 'text':
+        executed.append('text')
+        tables = detect(text_settings)
+    
+    plan['executed'] = executed
+    plan['elapsed'] = time.perf_counter() - start
+    return tables
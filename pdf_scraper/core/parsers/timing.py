@@ -0,0 +1,107 @@
+from typing import Callable, ContextManager, Dict, Iterator, List, Optional
+from contextlib import contextmanager, nullcontext
+import functools
+import time
+
+# Shared do-nothing context for stages run without a timer
+_NO_STAGE = nullcontext()
+
+class StageTimer:
+    """Wall time, CPU time and call counts accumulated per named stage.
+    
+    Stage names are dotted by component, e.g. 'parser.extract_tables',
+    'extractor._extract_lab_results' or 'pattern.date'. Stages nest, and
+    each reports its inclusive time: 'parser.extract_text' includes the
+    'parser.words' stages of the pages it lays out.
+    """
+    
+    def __init__(self):
+        # Stage name -> [calls, wall seconds, CPU seconds]
+        self.stages: Dict[str, List[float]] = {}
+    
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Time the enclosed block as one call of a stage.
+        
+        Args:
+            name: Stage name
+        """
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - wall, time.process_time() - cpu)
+    
+    def add(self, name: str, wall: float, cpu: float, calls: int = 1):
+        """Add time spent in a stage.
+        
+        Args:
+            name: Stage name
+            wall: Wall-clock seconds
+            cpu: CPU seconds of this process
+            calls: Number of calls the time covers
+        """
+        totals = self.stages.get(name)
+        if totals is None:
+            totals = self.stages[name] = [0, 0.0, 0.0]
+        totals[0] += calls
+        totals[1] += wall
+        totals[2] += cpu
+    
+    def merge(self, report: Dict[str, Dict[str, float]]):
+        """Add the stages of another timer's report, e.g. one file's into a batch's.
+        
+        Args:
+            report: Report as returned by report()
+        """
+        for name, totals in report.items():
+            self.add(name, totals['wall'], totals['cpu'], totals['calls'])
+    
+    def report(self) -> Dict[str, Dict[str, float]]:
+        """Summarize the stages, slowest first.
+        
+        Returns:
+            Dict[str, Dict[str, float]]: 'calls', 'wall' and 'cpu' seconds per stage
+        """
+        return {
+            name: {"calls": int(calls), "wall": round(wall, 6), "cpu": round(cpu, 6)}
+            for name, (calls, wall, cpu) in sorted(self.stages.items(), key=lambda item: -item[1][1])
+        }
+    
+    def format_report(self) -> str:
+        """Render the report as a fixed-width table."""
+        report = self.report()
+        width = max((len(name) for name in report), default=5)
+        lines = [f"{'stage':<{width}}  {'calls':>7}  {'wall s':>9}  {'cpu s':>9}"]
+        for name, totals in report.items():
+            lines.append(f"{name:<{width}}  {totals['calls']:>7}  {totals['wall']:>9.3f}  {totals['cpu']:>9.3f}")
+        return '\n'.join(lines)
+
+def stage(timer: Optional[StageTimer], name: str) -> ContextManager[None]:
+    """Time a block as a stage of timer, or do nothing if timer is None.
+    
+    Args:
+        timer: Timer to record into; timing is disabled if None
+        name: Stage name
+    """
+    return _NO_STAGE if timer is None else timer.stage(name)
+
+def timed(name: str) -> Callable:
+    """Time a method as a stage of its object's ``timer``.
+    
+    With no timer set the method is called straight through, so a disabled
+    timer costs one attribute lookup per call.
+    
+    Args:
+        name: Stage name
+    """
+    def decorator(method: Callable) -> Callable:
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            timer = self.timer
+            if timer is None:
+                return method(self, *args, **kwargs)
+            with timer.stage(name):
+                return method(self, *args, **kwargs)
+        return wrapper
+    return decorator
\ No newline at end of file
@@ -0,0 +1,185 @@
+from typing import Dict, List, Any, Iterable, Iterator, Sequence, Tuple
+import numpy as np
+
+class StringPool:
+    """Interns word strings so each distinct word is stored once per document."""
+    
+    def __init__(self):
+        self._ids: Dict[str, int] = {}
+        self.strings: List[str] = []
+    
+    def __len__(self) -> int:
+        return len(self.strings)
+    
+    def intern(self, texts: Iterable[str]) -> np.ndarray:
+        """Map strings to pool ids, adding the ones not seen before.
+        
+        Args:
+            texts: Word strings
+        
+        Returns:
+            np.ndarray: int32 pool id per string
+        """
+        ids = self._ids
+        strings = self.strings
+        out = []
+        for text in texts:
+            index = ids.get(text)
+            if index is None:
+                index = ids[text] = len(strings)
+                strings.append(text)
+            out.append(index)
+        return np.array(out, dtype=np.int32)
+    
+    def lookup(self, text_ids: np.ndarray) -> List[str]:
+        """Resolve pool ids to strings."""
+        strings = self.strings
+        return [strings[i] for i in text_ids.tolist()]
+
+class WordStore:
+    """Columnar store of positioned words.
+    
+    Coordinates live in float64 arrays and word strings in a shared
+    StringPool, replacing one dict per word. Iterating yields the familiar
+    word dicts for callers that need them; text assembly and layout
+    analysis work on the arrays directly.
+    """
+    
+    COLUMNS = ('x0', 'top', 'x1', 'bottom')
+    
+    def __init__(self, pool: StringPool, text_ids: np.ndarray, x0: np.ndarray, top: np.ndarray,
+                 x1: np.ndarray, bottom: np.ndarray, page: np.ndarray):
+        self.pool = pool
+        self.text_ids = text_ids
+        self.x0 = x0
+        self.top = top
+        self.x1 = x1
+        self.bottom = bottom
+        self.page = page
+    
+    @classmethod
+    def from_tuples(cls, rows: Sequence[Tuple], pool: StringPool, page_number: int = 0) -> 'WordStore':
+        """Build a store from (x0, top, x1, bottom, text, ...) tuples.
+        
+        Args:
+            rows: Word tuples in reading order, e.g. from PyMuPDF's get_text("words")
+            pool: String pool the words are interned in
+            page_number: Page number (1-based) the words are on
+        
+        Returns:
+            WordStore: Store holding the words in the given order
+        """
+        coords = np.array([row[:4] for row in rows], dtype=np.float64).reshape(-1, 4)
+        return cls(
+            pool,
+            pool.intern(row[4] for row in rows),
+            *(np.ascontiguousarray(coords[:, i]) for i in range(4)),
+            np.full(len(rows), page_number, dtype=np.int32)
+        )
+    
+    @classmethod
+    def from_dicts(cls, words: Sequence[Dict[str, Any]], pool: StringPool, page_number: int = 0) -> 'WordStore':
+        """Build a store from word dicts with text and x0/top/x1/bottom keys.
+        
+        Args:
+            words: Word dicts in reading order, e.g. from pdfplumber's extract_words
+            pool: String pool the words are interned in
+            page_number: Page number (1-based) the words are on
+        
+        Returns:
+            WordStore: Store holding the words in the given order
+        """
+        return cls.from_tuples(
+            [(w['x0'], w['top'], w['x1'], w['bottom'], w['text']) for w in words],
+            pool,
+            page_number
+        )
+    
+    @classmethod
+    def from_json(cls, data: Dict[str, List[Any]], pool: StringPool, page_number: int = 0) -> 'WordStore':
+        """Rebuild a store from the output of to_json."""
+        return cls(
+            pool,
+            pool.intern(data['text']),
+            *(np.array(data[column], dtype=np.float64) for column in cls.COLUMNS),
+            np.full(len(data['text']), page_number, dtype=np.int32)
+        )
+    
+    def to_json(self) -> Dict[str, List[Any]]:
+        """Column lists with resolved strings, for the persistent cache."""
+        data = {"text": self.texts()}
+        for column in self.COLUMNS:
+            data[column] = getattr(self, column).tolist()
+        return data
+    
+    def __len__(self) -> int:
+        return len(self.text_ids)
+    
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        return iter(self.to_dicts())
+    
+    def texts(self) -> List[str]:
+        """Word strings in store order."""
+        return self.pool.lookup(self.text_ids)
+    
+    def to_dicts(self) -> List[Dict[str, Any]]:
+        """Words as dicts with text and x0/top/x1/bottom coordinates."""
+        return [
+            {"text": text, "x0": x0, "top": top, "x1": x1, "bottom": bottom}
+            for text, x0, top, x1, bottom in zip(
+                self.texts(), self.x0.tolist(), self.top.tolist(),
+                self.x1.tolist(), self.bottom.tolist()
+            )
+        ]
+    
+    def line_starts(self, threshold: float) -> np.ndarray:
+        """Indices of the words that start a new line.
+        
+        A word starts a new line when it sits more than threshold points below
+        the first word of the current line. Line starts are found one line at
+        a time with array searches, never word by word: a binary search over
+        top when the words are ordered top to bottom, a vectorized comparison
+        over the remaining words otherwise.
+        
+        Args:
+            threshold: Vertical distance in points that starts a new line
+        
+        Returns:
+            np.ndarray: Index of the first word of each line
+        """
+        count = len(self)
+        if not count:
+            return np.empty(0, dtype=np.intp)
+        
+        top = self.top
+        monotonic = bool(np.all(top[1:] >= top[:-1]))
+        starts = [0]
+        start = 0
+        while True:
+            if monotonic:
+                start = int(np.searchsorted(top, top[start] + threshold, side='right'))
+            else:
+                below = np.flatnonzero(top[start + 1:] - top[start] > threshold)
+                start = start + 1 + int(below[0]) if len(below) else count
+            if start >= count:
+                break
+            starts.append(start)
+        return np.array(starts, dtype=np.intp)
+    
+    def lines(self, threshold: float) -> List[str]:
+        """Group words into lines of space-separated text.
+        
+        Args:
+            threshold: Vertical distance in points that starts a new line
+                (see line_starts)
+        
+        Returns:
+            List[str]: Text of each line in reading order
+        """
+        texts = self.texts()
+        bounds = self.line_starts(threshold).tolist() + [len(texts)]
+        return [' '.join(texts[a:b]) for a, b in zip(bounds, bounds[1:])]
+    
+    def rows(self, tolerance: float) -> np.ndarray:
+        """Row bucket of each word, words within tolerance points of each other sharing one."""
+        return np.round(self.top / tolerance).astype(np.int64)
@@ -3,5 +3,8 @@ Data processing implementations.
 """
 
 from .processor import PDFProcessor
+from .pool import ParserPool
+from .manifest import BatchManifest
+from .parquet import ParquetResultWriter
  
-__all__ = ['PDFProcessor'] 
\ No newline at end of file
+__all__ = ['PDFProcessor', 'ParserPool', 'BatchManifest', 'ParquetResultWriter'] 
\ No newline at end of file
@@ -0,0 +1,164 @@
+import os
+import json
+import hashlib
+import tempfile
+from typing import Dict, List, Any, Iterable, Set, Tuple
+from pathlib import Path
+
+class BatchManifest:
+    """Record of the files a batch run has written results for.
+    
+    The manifest sits next to an NDJSON output as <output>.manifest.jsonl,
+    one JSON line per result line, in the same order: the file's path
+    (relative to the batch directory), size, mtime, content hash, and the
+    template and version that produced the result. Each entry is appended
+    once its result has been written, so after a crash both files describe
+    exactly the files that were finished.
+    
+    A later run over the same directory then only processes files that are
+    new, modified, or were processed with another template or version.
+    The stale result lines of modified files are dropped from the output
+    before new results are appended.
+    """
+    
+    def __init__(self, output_path: str, template: str, version: str, resume: bool = True):
+        """Open the manifest of an NDJSON output.
+        
+        Args:
+            output_path: Path of the NDJSON file the manifest describes
+            template: Name of the template (extractor) producing the results
+            version: Digest of the extractor and settings producing the results
+            resume: Continue from an existing manifest; otherwise start afresh,
+                and the output is to be rewritten from scratch
+        """
+        self.output_path = output_path
+        self.path = f"{output_path}.manifest.jsonl"
+        self.template = template
+        self.version = version
+        self.resume = resume
+        self.entries: List[Dict[str, Any]] = self._load() if resume else []
+        if not resume and os.path.exists(self.path):
+            os.remove(self.path)
+    
+    def _load(self) -> List[Dict[str, Any]]:
+        """Read complete manifest entries; a line cut short by a crash ends the list."""
+        entries = []
+        if not os.path.exists(self.path):
+            return entries
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                if not line.endswith('\n'):
+                    break
+                try:
+                    entries.append(json.loads(line))
+                except json.JSONDecodeError:
+                    break
+        return entries
+    
+    @staticmethod
+    def file_hash(file_path: Path) -> str:
+        """SHA-256 of a file's contents."""
+        digest = hashlib.sha256()
+        with open(file_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                digest.update(chunk)
+        return digest.hexdigest()
+    
+    @staticmethod
+    def _key(root: Path, file_path: Path) -> str:
+        return file_path.relative_to(root).as_posix()
+    
+    def _is_current(self, root: Path, file_path: Path, latest: Dict[str, Dict[str, Any]]) -> bool:
+        """Whether a file's recorded result is still valid."""
+        entry = latest.get(self._key(root, file_path))
+        if entry is None or entry['template'] != self.template or entry['version'] != self.version:
+            return False
+        stat = file_path.stat()
+        if stat.st_size != entry['size']:
+            return False
+        # A touched but unchanged file is recognized by its content hash
+        return stat.st_mtime == entry['mtime'] or self.file_hash(file_path) == entry['sha256']
+    
+    def pending(self, root: Path, pdf_files: Iterable[Path]) -> List[Path]:
+        """Select the files to process, and drop results about to be replaced.
+        
+        Brings the output in line with the manifest first: result lines
+        without an entry (written just before a crash) and entries without a
+        result line (the output was truncated or removed) are discarded. The
+        results and entries of files no longer found, and of every file
+        returned, are then removed, so that appending the new results leaves
+        one line per file present.
+        
+        Args:
+            root: Batch directory, against which paths are recorded
+            pdf_files: Files found in the batch directory
+        
+        Returns:
+            List[Path]: Files without a valid recorded result, in the given order
+        """
+        root = Path(root)
+        pdf_files = list(pdf_files)
+        lines, complete = self._count_lines()
+        keep = list(range(min(complete, len(self.entries))))
+        
+        latest = {self.entries[i]['path']: self.entries[i] for i in keep}
+        pending = [f for f in pdf_files if not self._is_current(root, f, latest)]
+        # Results of files that are gone or about to be reprocessed are dropped
+        current: Set[str] = {self._key(root, f) for f in pdf_files} - {self._key(root, f) for f in pending}
+        keep = [i for i in keep if self.entries[i]['path'] in current]
+        
+        if len(keep) != lines or len(keep) != len(self.entries):
+            self._rewrite(keep)
+        return pending
+    
+    def _count_lines(self) -> Tuple[int, int]:
+        """Number of lines in the output, and of those complete (a crash may cut the last short)."""
+        lines = complete = 0
+        if os.path.exists(self.output_path):
+            with open(self.output_path, 'rb') as f:
+                for line in f:
+                    lines += 1
+                    complete += line.endswith(b'\n')
+        return lines, complete
+    
+    def _rewrite(self, keep: List[int]):
+        """Keep only the given result lines and entries, replacing both files atomically."""
+        wanted = set(keep)
+        directory = os.path.dirname(os.path.abspath(self.output_path))
+        
+        fd, temp_output = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        with os.fdopen(fd, 'wb') as out:
+            if os.path.exists(self.output_path):
+                with open(self.output_path, 'rb') as f:
+                    for index, line in enumerate(f):
+                        if index in wanted and line.endswith(b'\n'):
+                            out.write(line)
+        
+        self.entries = [self.entries[i] for i in keep]
+        fd, temp_manifest = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        with os.fdopen(fd, 'w', encoding='utf-8') as out:
+            for entry in self.entries:
+                out.write(json.dumps(entry) + '\n')
+        
+        os.replace(temp_output, self.output_path)
+        os.replace(temp_manifest, self.path)
+    
+    def record(self, root: Path, file_path: Path):
+        """Append the entry of a file whose result has just been written.
+        
+        Args:
+            root: Batch directory
+            file_path: File the result came from
+        """
+        stat = file_path.stat()
+        entry = {
+            "path": self._key(Path(root), file_path),
+            "size": stat.st_size,
+            "mtime": stat.st_mtime,
+            "sha256": self.file_hash(file_path),
+            "template": self.template,
+            "version": self.version
+        }
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(entry) + '\n')
+        self.entries.append(entry)
\ No newline at end of file
@@ -0,0 +1,110 @@
+import json
+import pyarrow as pa
+import pyarrow.parquet as pq
+from typing import Dict, List, Any, Optional
+
+# Arrow types of the scalar schema types (see BaseExtractor.SCHEMA)
+SCALAR_TYPES = {'str': pa.string(), 'int': pa.int64(), 'float': pa.float64(), 'json': pa.string()}
+
+def arrow_type(spec: Any) -> pa.DataType:
+    """Arrow type of a schema type: records become structs, lists lists.
+    
+    Args:
+        spec: Schema type, as in BaseExtractor.SCHEMA
+    
+    Returns:
+        pa.DataType: Corresponding Arrow type
+    """
+    if isinstance(spec, dict):
+        return pa.struct([pa.field(name, arrow_type(value)) for name, value in spec.items()])
+    if isinstance(spec, list):
+        return pa.list_(arrow_type(spec[0]))
+    return SCALAR_TYPES[spec]
+
+def arrow_schema(spec: Dict[str, Any]) -> pa.Schema:
+    """Arrow schema with one column per field of a result schema."""
+    return pa.schema([pa.field(name, arrow_type(value)) for name, value in spec.items()])
+
+def conform(value: Any, spec: Any, path: str = 'value') -> Any:
+    """Shape a result value to its schema type for conversion to Arrow.
+    
+    Keys the type does not name are dropped and missing ones set to None;
+    'str' takes any scalar (e.g. a non-string metadata entry) as its str(),
+    and 'float' takes ints. Any other mismatch raises rather than being
+    stored as null, so a schema that no longer describes its extractor's
+    output fails on the first result instead of silently losing data.
+    
+    Args:
+        value: Result value
+        spec: Schema type of the value
+        path: Where the value sits in the result, for error messages
+    
+    Returns:
+        Any: Value Arrow converts to arrow_type(spec)
+    """
+    if value is None:
+        return None
+    if spec == 'json':
+        return json.dumps(value, ensure_ascii=False, default=str)
+    if isinstance(spec, dict):
+        if isinstance(value, dict):
+            return {name: conform(value.get(name), field, f"{path}.{name}") for name, field in spec.items()}
+    elif isinstance(spec, list):
+        if isinstance(value, (list, tuple)):
+            return [conform(item, spec[0], f"{path}[{index}]") for index, item in enumerate(value)]
+    elif spec == 'str':
+        if not isinstance(value, (dict, list, tuple, set)):
+            return str(value)
+    elif not isinstance(value, bool):
+        if spec == 'int' and isinstance(value, int):
+            return value
+        if spec == 'float' and isinstance(value, (int, float)):
+            return float(value)
+    raise ValueError(f"{path}: expected {spec!r}, got {type(value).__name__} {value!r:.80}")
+
+class ParquetResultWriter:
+    """Writes results to a Parquet file one row group at a time.
+    
+    Every file gets the same columns, from the result schema rather than
+    from the results seen, so batches written separately load together.
+    Nested fields are stored as struct and list columns.
+    """
+    
+    def __init__(self, output_path: str, schema: Dict[str, Any], row_group_size: int = 1024):
+        """Open a Parquet file for writing.
+        
+        Args:
+            output_path: Path to save the Parquet file
+            schema: Type of each result field (see PDFProcessor.result_schema)
+            row_group_size: Number of results buffered before a row group is written
+        """
+        self.spec = schema
+        self.schema = arrow_schema(schema)
+        self.row_group_size = max(1, row_group_size)
+        self._rows: List[Dict[str, Any]] = []
+        self._writer: Optional[pq.ParquetWriter] = pq.ParquetWriter(output_path, self.schema)
+    
+    def write(self, result: Dict[str, Any]):
+        """Add a result, writing a row group once enough are buffered."""
+        self._rows.append({name: conform(result.get(name), field, name) for name, field in self.spec.items()})
+        if len(self._rows) >= self.row_group_size:
+            self.flush()
+    
+    def flush(self):
+        """Write the buffered results as a row group."""
+        if self._rows:
+            self._writer.write_table(pa.Table.from_pylist(self._rows, schema=self.schema))
+            self._rows = []
+    
+    def close(self):
+        """Write any buffered results and finish the file."""
+        if self._writer is not None:
+            self.flush()
+            self._writer.close()
+            self._writer = None
+    
+    def __enter__(self) -> 'ParquetResultWriter':
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
\ No newline at end of file
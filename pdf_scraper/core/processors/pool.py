@@ -0,0 +1,115 @@
+import os
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Tuple
+from ..parsers.base import BaseParser
+
+class ParserPool:
+    """Bounded pool of parsers for recently used files.
+    
+    Parsers are kept in least-recently-used order so repeated access to a
+    file reuses its open document and parse cache. When more than max_open
+    files are pooled, the least recently used parser is closed and dropped,
+    so the number of open file handles never exceeds max_open.
+    """
+    
+    def __init__(self, parser_class: type[BaseParser], max_open: int = 8,
+                 parser_options: Optional[Dict[str, Any]] = None):
+        """Initialize the pool.
+        
+        Args:
+            parser_class: Parser class used to open files
+            max_open: Maximum number of files kept open at once
+            parser_options: Keyword arguments passed to every parser
+        """
+        if max_open < 1:
+            raise ValueError("max_open must be at least 1")
+        self.parser_class = parser_class
+        self.max_open = max_open
+        self.parser_options = parser_options or {}
+        self._parsers: 'OrderedDict[str, Tuple[BaseParser, Tuple[int, int]]]' = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.peak_open = 0
+    
+    def __len__(self) -> int:
+        return len(self._parsers)
+    
+    def __enter__(self) -> 'ParserPool':
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+    
+    @staticmethod
+    def _signature(file_path: str) -> Tuple[int, int]:
+        stat = os.stat(file_path)
+        return stat.st_mtime_ns, stat.st_size
+    
+    def get(self, file_path: str) -> BaseParser:
+        """Return the pooled parser for a file, opening a new one if needed.
+        
+        A pooled parser is replaced if the file changed on disk since it
+        was opened.
+        
+        Args:
+            file_path: Path to the PDF file
+        
+        Returns:
+            BaseParser: Parser for the file, owned by the pool
+        """
+        key = os.path.abspath(file_path)
+        signature = self._signature(key)
+        self.peak_open = max(self.peak_open, self.open_count())
+        
+        entry = self._parsers.get(key)
+        if entry is not None:
+            parser, pooled_signature = entry
+            if pooled_signature == signature:
+                self.hits += 1
+                self._parsers.move_to_end(key)
+                return parser
+            self.discard(key)
+        
+        self.misses += 1
+        while len(self._parsers) >= self.max_open:
+            _, (evicted, _) = self._parsers.popitem(last=False)
+            evicted.close()
+            self.evictions += 1
+        
+        parser = self.parser_class(file_path, **self.parser_options)
+        self._parsers[key] = (parser, signature)
+        return parser
+    
+    def discard(self, file_path: str):
+        """Close and drop the parser of a file, if pooled."""
+        entry = self._parsers.pop(os.path.abspath(file_path), None)
+        if entry is not None:
+            entry[0].close()
+    
+    def close(self):
+        """Close and drop every pooled parser."""
+        self.peak_open = max(self.peak_open, self.open_count())
+        while self._parsers:
+            _, (parser, _) = self._parsers.popitem(last=False)
+            parser.close()
+    
+    def open_count(self) -> int:
+        """Number of pooled parsers currently holding their file open."""
+        return sum(1 for parser, _ in self._parsers.values() if parser.is_open)
+    
+    def stats(self) -> Dict[str, int]:
+        """Report pool usage.
+        
+        Returns:
+            Dict[str, int]: Pooled parsers, open handles now and at peak, and
+                hit, miss and eviction counts
+        """
+        return {
+            "pooled": len(self._parsers),
+            "open": self.open_count(),
+            "peak_open": max(self.peak_open, self.open_count()),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions
+        }
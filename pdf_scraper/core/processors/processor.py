@@ -1,46 +1,271 @@
 import os
+import copy
 import json
+import hashlib
 import pandas as pd
-from typing import Dict, List, Any, Optional, Union
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from typing import Dict, List, Any, Iterable, Iterator, Optional, Tuple, Union
+from functools import partial
 from pathlib import Path
-from ..parsers.pdfplumber_parser import PDFPlumberParser
+from ..parsers import BaseParser, get_parser_class
+from ..parsers.source import PDFSource, as_buffer
+from ..parsers.cache import DiskCache
+from ..parsers.timing import StageTimer, stage
 from ..extractors.base import BaseExtractor
+from ..extractors.template import ExtractionTemplate
+from .pool import ParserPool
+from .manifest import BatchManifest
+from .parquet import ParquetResultWriter
 
 class PDFProcessor:
     """Main processor class for handling PDF extraction and output formatting."""
     
-    def __init__(self, extractor_class: type[BaseExtractor]):
+    def __init__(self, extractor_class: type[BaseExtractor], engine: str = 'pdfplumber', streaming: bool = False,
+                 parser_options: Optional[Dict[str, Any]] = None, early_stop: bool = False,
+                 cache_dir: Optional[str] = None, cache_max_bytes: int = 1 << 30,
+                 image_dir: Optional[str] = None, max_open: int = 8, fields: Optional[List[str]] = None,
+                 profile: bool = False):
         """Initialize processor with an extractor class.
         
         Args:
             extractor_class: Class of the extractor to use
+            engine: Parser engine to use ('pdfplumber' or 'pymupdf')
+            streaming: Extract page by page with bounded memory (see BaseExtractor.extract_stream)
+            parser_options: Extra keyword arguments for the parser, e.g. {'ocr': OCRConfig()}
+                or {'pages': '1-3'}
+            early_stop: Stop parsing once the extractor's EARLY_STOP_FIELDS are found
+                (implies streaming)
+            cache_dir: Directory of the persistent parse cache; an unchanged file parsed
+                with the same engine and settings is not parsed again. Disabled if None
+            cache_max_bytes: Size of the parse cache before old entries are evicted
+            image_dir: Directory to write the raw image streams of each file to; results
+                then list image occurrences and the streams they reference
+            max_open: Maximum number of PDF files kept open at once; parsers of recently
+                processed files are pooled and the least recently used one is closed
+            fields: Output fields of the extractor to compute (see BaseExtractor.FIELDS);
+                all if None. Unrequested fields and the parsing only they need are skipped
+            profile: Time each parsing and extraction stage; results then carry a
+                '_timings' block, and the batch totals are kept in timings
         """
+        # Constructor arguments, from which worker processes build their own processor
+        self._settings = dict(
+            extractor_class=extractor_class, engine=engine, streaming=streaming,
+            parser_options=parser_options, early_stop=early_stop, cache_dir=cache_dir,
+            cache_max_bytes=cache_max_bytes, image_dir=image_dir, max_open=max_open,
+            fields=fields, profile=profile
+        )
         self.extractor_class = extractor_class
+        self.engine = engine
+        self.streaming = streaming
+        self.parser_options = parser_options or {}
+        self.early_stop = early_stop
+        self.fields = fields
+        self.profile = profile
+        # Stage timings summed over every file processed
+        self.timings = StageTimer()
+        self.parser_class = get_parser_class(engine)
+        self.parse_cache = DiskCache(cache_dir, cache_max_bytes) if cache_dir else None
+        self.image_dir = image_dir
+        self.pool = ParserPool(self.parser_class, max_open,
+                               dict(self.parser_options, persistent_cache=self.parse_cache))
     
-    def process_file(self, file_path: str) -> Dict[str, Any]:
+    def process_file(self, file_path: PDFSource) -> Dict[str, Any]:
         """Process a single PDF file.
         
         Args:
-            file_path: Path to the PDF file
-            
+            file_path: Path to the PDF file, or the PDF's contents in memory
+                (bytes, memoryview or mmap, e.g. from BaseScraper.fetch_pdf)
+        
         Returns:
             Dict[str, Any]: Extracted data
         """
-        parser = PDFPlumberParser(file_path)
+        if as_buffer(file_path) is not None:
+            # In-memory documents are not pooled; parse and release right away
+            with self.parser_class(file_path, **self.pool.parser_options) as parser:
+                return self._process(parser)
+        return self._process(self.pool.get(file_path))
+    
+    def _process(self, parser: BaseParser) -> Dict[str, Any]:
+        """Run the extractor over a parser, timing its stages if profiling."""
+        timer = StageTimer() if self.profile else None
+        parser.timer = timer
+        try:
+            with stage(timer, 'processor.file'):
+                result = self._extract(parser)
+        finally:
+            parser.timer = None
+        
+        if timer is not None:
+            result['_timings'] = timer.report()
+            self.timings.merge(result['_timings'])
+        return result
+    
+    def _extract(self, parser: BaseParser) -> Dict[str, Any]:
+        """Run the extractor over a parser and persist its parse results."""
         extractor = self.extractor_class(parser)
-        return extractor.extract()
+        if self.streaming or self.early_stop:
+            result = extractor.extract_stream(early_stop=self.early_stop, fields=self.fields)
+        else:
+            result = extractor.extract(fields=self.fields)
+        if self.image_dir:
+            # A field projection may have narrowed the parser to other artifacts
+            parser.artifacts.add('images')
+            images = parser.extract_image_streams(self.image_dir)
+            result['images'] = images['images']
+            result['image_streams'] = images['streams']
+        if parser.dropped_pages:
+            # Pages skipped for running over the parser's time budget
+            result['dropped_pages'] = list(parser.dropped_pages)
+        parser.persist()
+        return result
+    
+    def close(self):
+        """Close every PDF file the processor holds open, and stop OCR workers."""
+        self.pool.close()
+        ocr = self.parser_options.get('ocr')
+        if ocr is not None:
+            ocr.close()
+    
+    def __enter__(self) -> 'PDFProcessor':
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+    
+    def handle_stats(self) -> Dict[str, int]:
+        """Report open file handles, including the most held open at once.
+        
+        Returns:
+            Dict[str, int]: Parser pool statistics (see ParserPool.stats)
+        """
+        return self.pool.stats()
+    
+    def timing_report(self) -> Dict[str, Dict[str, float]]:
+        """Report stage timings summed over every file processed with profiling.
+        
+        Returns:
+            Dict[str, Dict[str, float]]: 'calls', 'wall' and 'cpu' seconds per
+                stage, slowest first; 'processor.file' counts the files
+        """
+        return self.timings.report()
+    
+    def _extractor_template(self) -> Tuple[type, Optional[ExtractionTemplate]]:
+        """The extractor class, and its template if it is a TemplateExtractor bound to one."""
+        extractor, template = self.extractor_class, None
+        if isinstance(extractor, partial):
+            template = extractor.keywords.get('template')
+            extractor = extractor.func
+            if isinstance(template, str):
+                template = ExtractionTemplate.load(template)
+        return extractor, template
+    
+    def result_schema(self) -> Dict[str, Any]:
+        """Type of each field of this processor's results, in output order.
+        
+        The extractor's SCHEMA (or its template's) narrowed to the requested
+        fields, followed by what the processor adds: image occurrences and
+        streams if image_dir is set and timings if profiling, as JSON text,
+        dropped pages and the file name.
+        
+        Returns:
+            Dict[str, Any]: Schema types keyed by field (see BaseExtractor.SCHEMA)
+        """
+        extractor, template = self._extractor_template()
+        schema = template.schema() if template is not None else dict(extractor.SCHEMA)
+        if self.fields is not None:
+            schema = {name: value for name, value in schema.items() if name in self.fields}
+        if self.image_dir:
+            schema['images'] = 'json'
+            schema['image_streams'] = 'json'
+        schema['dropped_pages'] = [{'page': 'int', 'budget': 'str', 'elapsed': 'float'}]
+        if self.profile:
+            schema['_timings'] = 'json'
+        schema['file_name'] = 'str'
+        return schema
+    
+    def batch_signature(self) -> Dict[str, str]:
+        """Identify what produces this processor's results, for batch manifests.
+        
+        Returns:
+            Dict[str, str]: 'template', the template or extractor name, and
+                'version', a digest of the extractor, template definition,
+                parser engine and version, and every setting that changes results
+        """
+        extractor, template = self._extractor_template()
+        spec = {
+            "extractor": f"{extractor.__module__}.{extractor.__qualname__}",
+            "template": {
+                "fields": template.fields, "pages": template.pages, "early_stop": template.early_stop,
+                "ignore_case": template.ignore_case
+            } if template is not None else None,
+            "fields": self.fields,
+            "streaming": self.streaming,
+            "early_stop": self.early_stop,
+            "images": bool(self.image_dir),
+            "engine": self.engine,
+            "engine_version": self.parser_class.engine_version(),
+            "cache_format": self.parser_class.CACHE_FORMAT,
+            "parser_options": self.parser_options
+        }
+        digest = hashlib.sha256(json.dumps(spec, sort_keys=True, default=_describe_setting).encode('utf-8'))
+        return {
+            "template": getattr(template, 'name', None) or extractor.__name__,
+            "version": digest.hexdigest()[:16]
+        }
     
-    def process_directory(self, directory: str, recursive: bool = False) -> List[Dict[str, Any]]:
+    def open_manifest(self, output_path: str, resume: bool = True) -> BatchManifest:
+        """Open the manifest of a batch's NDJSON output (see iter_directory).
+        
+        Args:
+            output_path: Path of the NDJSON output
+            resume: Continue from the files already recorded; otherwise the
+                manifest is started afresh and the output must be rewritten
+        
+        Returns:
+            BatchManifest: Manifest signed with batch_signature()
+        """
+        return BatchManifest(output_path, resume=resume, **self.batch_signature())
+    
+    def process_directory(self, directory: str, recursive: bool = False, workers: Optional[int] = 1,
+                          chunksize: int = 1, ordered: bool = True) -> List[Dict[str, Any]]:
         """Process all PDF files in a directory.
         
+        Holds every result in memory; see iter_directory for large batches.
+        
         Args:
             directory: Path to directory containing PDFs
             recursive: Whether to process subdirectories
-            
+            workers: Number of worker processes; one per CPU if None, and files are
+                processed in this process if 1
+            chunksize: Number of files handed to a worker at a time; larger chunks
+                cut inter-process overhead for many small files
+            ordered: Return results in directory listing order; otherwise in the
+                order files finish
+        
         Returns:
             List[Dict[str, Any]]: List of extracted data from each PDF
         """
-        results = []
+        return list(self.iter_directory(directory, recursive, workers, chunksize, ordered))
+    
+    def iter_directory(self, directory: str, recursive: bool = False, workers: Optional[int] = 1,
+                       chunksize: int = 1, ordered: bool = True,
+                       manifest: Optional[BatchManifest] = None) -> Iterator[Dict[str, Any]]:
+        """Process all PDF files in a directory, yielding each result as it is ready.
+        
+        Only the results not yet consumed are held, so memory stays flat over
+        any number of files. Arguments are as for process_directory, and:
+        
+        Args:
+            manifest: Manifest of the NDJSON output the results are appended to
+                (see open_manifest). Files it records as done and unchanged are
+                skipped, and the output's stale lines are dropped before the
+                first result; each file is recorded once its result has been
+                consumed, i.e. written, so an interrupted run resumes where it
+                stopped
+        
+        Yields:
+            Dict[str, Any]: Extracted data of a PDF, with its 'file_name'
+        """
         path = Path(directory)
         
         # Get all PDF files
@@ -49,16 +274,94 @@ class PDFProcessor:
         else:
             pdf_files = list(path.glob("*.pdf"))
         
-        # Process each file
-        for pdf_file in pdf_files:
-            try:
-                result = self.process_file(str(pdf_file))
-                result['file_name'] = pdf_file.name
-                results.append(result)
-            except Exception as e:
-                print(f"Error processing {pdf_file}: {str(e)}")
+        if manifest is not None:
+            # Settled now rather than on first iteration, before the output is reopened
+            pdf_files = manifest.pending(path, pdf_files)
+        return self._iter_results(path, pdf_files, workers, chunksize, ordered, manifest)
+    
+    def _iter_results(self, path: Path, pdf_files: List[Path], workers: Optional[int], chunksize: int,
+                      ordered: bool, manifest: Optional[BatchManifest]) -> Iterator[Dict[str, Any]]:
+        """Yield the results of iter_directory, recording them in the manifest."""
+        # Process each file; failures are reported and skipped
+        for pdf_file, result, error in self._process_files(pdf_files, workers, chunksize, ordered):
+            if error is not None:
+                print(f"Error processing {pdf_file}: {error}")
+                continue
+            result['file_name'] = pdf_file.name
+            yield result
+            if manifest is not None:
+                manifest.record(path, pdf_file)
+    
+    def _process_files(self, pdf_files: List[Path], workers: Optional[int], chunksize: int,
+                       ordered: bool) -> Iterator[Tuple[Path, Optional[Dict[str, Any]], Optional[str]]]:
+        """Process files here or across worker processes.
+        
+        Yields:
+            Tuple[Path, Optional[Dict[str, Any]], Optional[str]]: File, its result
+                and None, or the file, None and the error message if it failed
+        """
+        workers = workers or os.cpu_count() or 1
+        if workers == 1 or len(pdf_files) <= 1:
+            for pdf_file in pdf_files:
+                try:
+                    yield pdf_file, self.process_file(str(pdf_file)), None
+                except Exception as e:
+                    yield pdf_file, None, str(e)
+            return
+        
+        chunksize = max(1, chunksize)
+        chunks = iter([pdf_files[i:i + chunksize] for i in range(0, len(pdf_files), chunksize)])
+        workers = min(workers, -(-len(pdf_files) // chunksize))
+        # Workers build their own parsers and extractors from the settings; only
+        # paths and plain results cross process boundaries
+        executor = ProcessPoolExecutor(max_workers=workers,
+                                       initializer=_init_worker, initargs=(self._worker_settings(),))
+        # Chunks in flight, in submission order. At most two per worker are
+        # submitted ahead of the consumer, so however large the directory, only
+        # that many chunks' results are held at once
+        futures: Dict[Future, List[Path]] = {}
+        
+        def submit_next():
+            chunk = next(chunks, None)
+            if chunk is not None:
+                futures[executor.submit(_process_chunk, [str(f) for f in chunk])] = chunk
         
-        return results
+        try:
+            for _ in range(2 * workers):
+                submit_next()
+            while futures:
+                if ordered:
+                    future = next(iter(futures))
+                else:
+                    future = next(iter(wait(futures, return_when=FIRST_COMPLETED).done))
+                chunk = futures.pop(future)
+                try:
+                    outcomes = future.result()
+                except Exception as e:
+                    # The worker itself died (e.g. a crash in native code)
+                    outcomes = [(str(f), None, f"Worker failed: {e}") for f in chunk]
+                # The future would otherwise keep the results alive while they are consumed
+                del future
+                submit_next()
+                for pdf_file, (_, result, error) in zip(chunk, outcomes):
+                    if result is not None and '_timings' in result:
+                        self.timings.merge(result['_timings'])
+                    yield pdf_file, result, error
+        finally:
+            executor.shutdown(cancel_futures=True)
+    
+    def _worker_settings(self) -> Dict[str, Any]:
+        """Constructor arguments for worker processes.
+        
+        OCR without a set number of workers runs in each worker process
+        itself, rather than each starting an OCR process per CPU.
+        """
+        ocr = self.parser_options.get('ocr')
+        if ocr is None or ocr.workers is not None:
+            return self._settings
+        ocr = copy.copy(ocr)
+        ocr.workers = 1
+        return dict(self._settings, parser_options=dict(self.parser_options, ocr=ocr))
     
     def export_json(self, data: Union[Dict[str, Any], List[Dict[str, Any]]], output_path: str):
         """Export data to JSON format.
@@ -70,6 +373,62 @@ class PDFProcessor:
         with open(output_path, 'w', encoding='utf-8') as f:
             json.dump(data, f, indent=2, ensure_ascii=False)
     
+    def export_ndjson(self, data: Union[Dict[str, Any], Iterable[Dict[str, Any]]], output_path: str,
+                      append: bool = False) -> int:
+        """Export data as newline-delimited JSON, one result per line.
+        
+        Each result is written and flushed as soon as it arrives, so results
+        can be streamed from iter_directory without being collected, and a
+        run that fails part way keeps everything written before the failure.
+        
+        Args:
+            data: Result, or results (any iterable, e.g. iter_directory), to export
+            output_path: Path to save NDJSON file
+            append: Add to an existing file instead of replacing it, e.g. when
+                resuming a batch with a manifest
+        
+        Returns:
+            int: Number of results written
+        """
+        if isinstance(data, dict):
+            data = [data]
+        
+        count = 0
+        with open(output_path, 'a' if append else 'w', encoding='utf-8') as f:
+            for item in data:
+                f.write(json.dumps(item, ensure_ascii=False) + '\n')
+                f.flush()
+                count += 1
+        return count
+    
+    def export_parquet(self, data: Union[Dict[str, Any], Iterable[Dict[str, Any]]], output_path: str,
+                       row_group_size: int = 1024) -> int:
+        """Export data to Parquet, with a column per result field.
+        
+        Columns follow result_schema(), so every export of the same extractor
+        and settings has the same schema whatever the results contain; nested
+        fields such as vital_signs or tables are struct and list columns.
+        Results are written a row group at a time as they arrive, so results
+        can be streamed from iter_directory without being collected.
+        
+        Args:
+            data: Result, or results (any iterable, e.g. iter_directory), to export
+            output_path: Path to save Parquet file
+            row_group_size: Number of results per row group
+        
+        Returns:
+            int: Number of results written
+        """
+        if isinstance(data, dict):
+            data = [data]
+        
+        count = 0
+        with ParquetResultWriter(output_path, self.result_schema(), row_group_size) as writer:
+            for item in data:
+                writer.write(item)
+                count += 1
+        return count
+    
     def export_csv(self, data: List[Dict[str, Any]], output_path: str):
         """Export data to CSV format.
         
@@ -144,4 +503,37 @@ class PDFProcessor:
             text = format_item(data)
         
         with open(output_path, 'w', encoding='utf-8') as f:
-            f.write(text) 
\ No newline at end of file
+            f.write(text) 
+
+# Processor of a worker process, built from the parent's settings by _init_worker
+_worker_processor: Optional[PDFProcessor] = None
+
+def _describe_setting(value: Any) -> Any:
+    """JSON stand-in for a parser option object in batch_signature."""
+    if hasattr(value, 'recognition_settings'):
+        # Only OCR settings that change recognized text, not workers or caching
+        return value.recognition_settings()
+    return vars(value) if hasattr(value, '__dict__') else str(value)
+
+def _init_worker(settings: Dict[str, Any]):
+    """Build the worker process's processor."""
+    global _worker_processor
+    _worker_processor = PDFProcessor(**settings)
+
+def _process_chunk(file_paths: List[str]) -> List[Tuple[str, Optional[Dict[str, Any]], Optional[str]]]:
+    """Process files in a worker process, catching each file's failure.
+    
+    Args:
+        file_paths: Paths of the PDF files to process
+    
+    Returns:
+        List[Tuple[str, Optional[Dict[str, Any]], Optional[str]]]: Path, result
+            and error message (None if the file succeeded) of each file, in order
+    """
+    outcomes = []
+    for file_path in file_paths:
+        try:
+            outcomes.append((file_path, _worker_processor.process_file(file_path), None))
+        except Exception as e:
+            outcomes.append((file_path, None, str(e)))
+    return outcomes
\ No newline at end of file
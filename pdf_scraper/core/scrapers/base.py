@@ -60,6 +60,26 @@ class BaseScraper(ABC):
             print(f"Error fetching {url}: {str(e)}")
             return None
     
+    def fetch_pdf(self, url: str) -> Optional[bytes]:
+        """Download a PDF into memory.
+        
+        The returned bytes can be handed straight to a parser or
+        PDFProcessor.process_file, without writing a temporary file.
+        
+        Args:
+            url: URL of the PDF
+            
+        Returns:
+            Optional[bytes]: PDF contents or None if failed
+        """
+        try:
+            response = self.session.get(url, timeout=30)
+            response.raise_for_status()
+            return response.content
+        except Exception as e:
+            print(f"Error fetching {url}: {str(e)}")
+            return None
+    
     def extract_links(self, soup: BeautifulSoup, base_url: str, pattern: str = None) -> List[str]:
         """Extract links from a page.
         
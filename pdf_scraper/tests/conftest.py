@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Tests import the application packages the way cli.py does, from pdf_scraper/
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,53 @@
+"""Regression corpus for the linear [1] style reference scanner.
+
+Each case checks iter_bracket_references against the lazy regex it
+replaced, and bounds the scanner's running time on inputs that make the
+regex backtrack or restart.
+"""
+import random
+import re
+import time
+import pytest
+from core.extractors.references import iter_bracket_references
+
+# The pattern iter_bracket_references replaced
+LAZY_PATTERN = re.compile(r'\[\d+\].*?(?=\[\d+\]|$)')
+
+def regex_references(text):
+    return [match.group(0) for match in LAZY_PATTERN.finditer(text)]
+
+def scan_timed(text):
+    start = time.perf_counter()
+    references = list(iter_bracket_references(text))
+    return references, time.perf_counter() - start
+
+PATHOLOGICAL = {
+    # Markers whose lines end without another marker, the last one unterminated
+    'unterminated_markers': '[1] no closing reference on this line\n' * 20000 + '[2] ' + 'x' * 100000,
+    # One marker per line, none resolving before the final line
+    'one_marker_per_line': ''.join(f'[{i}] reference {i}\n' for i in range(50000)),
+    # Multi-MB lines: long gaps between markers, and a marker-dense line
+    'multi_mb_line': '[1] ' + 'a' * 2000000 + ' [2] ' + 'b' * 2000000,
+    'multi_mb_markers': '[7]' * 500000,
+    'multi_mb_line_break': ('[1] ' + 'c' * 1000000 + '\n') * 3,
+    'bracket_noise': '[1' * 500000 + '[2]' + '] [' * 300000,
+}
+
+@pytest.mark.parametrize('name', sorted(PATHOLOGICAL))
+def test_pathological_inputs_match_regex_in_linear_time(name):
+    text = PATHOLOGICAL[name]
+    references, seconds = scan_timed(text)
+    assert references == regex_references(text)
+    # Linear in a few MB of text; generous enough for slow machines
+    assert seconds < 2.0
+
+def test_final_newline_and_empty_text():
+    for text in ('', '\n', '[1]', '[1]\n', '[1] a\n\n', 'x [1] a [2] b\n', '[1]\n[2] tail'):
+        assert list(iter_bracket_references(text)) == regex_references(text)
+
+def test_random_strings_match_regex():
+    rng = random.Random(20)
+    alphabet = '[]0123456789 a\n'
+    for _ in range(200000):
+        text = ''.join(rng.choice(alphabet) for _ in range(rng.randint(0, 24)))
+        assert list(iter_bracket_references(text)) == regex_references(text), repr(text)